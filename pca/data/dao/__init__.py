@@ -1,4 +1,8 @@
 from .abstract import AbstractDao  # noqa: F401
 from .abstract import QueryChain  # noqa: F401
+from .asynchronous import AsyncDaoAdapter  # noqa: F401
+from .asynchronous import AsyncQueryChain  # noqa: F401
+from .caching import CachingDao  # noqa: F401
+from .durable import DurableInMemoryDao  # noqa: F401
 from .file import FileDao  # noqa: F401
 from .in_memory import InMemoryDao  # noqa: F401
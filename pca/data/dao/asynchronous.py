@@ -0,0 +1,219 @@
+import asyncio
+import threading
+import typing as t
+
+from concurrent.futures import (
+    Executor,
+    ThreadPoolExecutor,
+)
+from functools import partial
+
+from pca.interfaces.dao import (
+    BatchOfKwargs,
+    Dto,
+    IAsyncDao,
+    IAsyncQueryChain,
+    Id,
+    IDao,
+    Ids,
+    IPredicate,
+    IQueryChain,
+)
+from pca.utils.dependency_injection import (
+    Component,
+    Inject,
+    get_di_context,
+)
+
+
+def _get_context_qualifier(target: t.Any) -> t.Any:
+    """The adapted DAO is the one registered with the same qualifier as the adapter."""
+    context = get_di_context(target)
+    return context.qualifier if context else None
+
+
+def _call_locked(lock: threading.Lock, function: t.Callable) -> t.Any:
+    """Technical detail of serializing the calls of a DAO that isn't thread-safe."""
+    with lock:
+        return function()
+
+
+class AsyncQueryChain(IAsyncQueryChain[Id]):
+    """
+    Asynchronous proxy for a `QueryChain` of a synchronous DAO. Lazy queries are gathered
+    synchronously, as they don't touch the persistence layer; evaluation is delegated
+    to the thread pool of the owning `AsyncDaoAdapter`.
+    """
+
+    def __init__(self, adapter: "AsyncDaoAdapter", query_chain: IQueryChain):
+        self._adapter = adapter
+        self._query_chain = query_chain
+
+    def __repr__(self):
+        return f"<AsyncQueryChain of {self._query_chain!r}>"
+
+    # lazy queries
+
+    def filter(self, predicate: IPredicate) -> "AsyncQueryChain":
+        """
+        Filters out objects by the predicate specifying conditions that they should met.
+        """
+        return AsyncQueryChain(self._adapter, self._query_chain.filter(predicate))
+
+    def filter_by(self, id_: Id = None, ids: Ids = None) -> "AsyncQueryChain":
+        """
+        Filters objects by a single id or a iterable of ids.
+
+        :raises: InvalidQueryError if:
+            * both `id_` and `ids` arguments are defined
+            * or the query is already filtered by id
+        """
+        return AsyncQueryChain(self._adapter, self._query_chain.filter_by(id_=id_, ids=ids))
+
+    # evaluating queries
+
+    async def _iterate(self) -> t.AsyncIterator[Dto]:
+        for dto in await self._adapter._run(list, self._query_chain):
+            yield dto
+
+    def __aiter__(self) -> t.AsyncIterator[Dto]:
+        """Yields values"""
+        return self._iterate()
+
+    async def get(self, id_: Id) -> t.Optional[Dto]:
+        """Returns object of given id, or None iff not present."""
+        return await self._adapter._run(self._query_chain.get, id_)
+
+    async def exists(self) -> bool:
+        """Returns whether any object specified by the query exist."""
+        return await self._adapter._run(self._query_chain.exists)
+
+    async def count(self) -> int:
+        """
+        Counts objects filtering them out by the query specifying conditions that they
+        should met.
+        """
+        return await self._adapter._run(self._query_chain.count)
+
+    # evaluating commands
+
+    async def update(self, **update) -> Ids:
+        """
+        Updates all objects specified by the query with given update.
+        """
+        return await self._adapter._run(self._query_chain.update, **update)
+
+    async def remove(self) -> Ids:
+        """
+        Removes all objects specified by the query from the collection.
+        """
+        return await self._adapter._run(self._query_chain.remove)
+
+
+class AsyncDaoAdapter(IAsyncDao[Id], Component):
+    """
+    Adapts any synchronous DAO (ie. `TinyDbDao`) to `IAsyncDao` interface. Blocking calls
+    of the DAO are run in a bounded thread pool, so they don't stall the event loop.
+
+    Most of the DAOs (i.e. `TinyDbDao`, which rewrites its whole file on each write) aren't
+    thread-safe, so the calls are serialized with a lock by default: they don't block
+    the event loop, but they don't run in parallel either. Declare the DAO `thread_safe`
+    (i.e. `SqliteDao`, with its pool of connections) to run the calls concurrently.
+
+    The adapted DAO might be given explicitly. Otherwise, it is injected as the `IDao`
+    registered with the same qualifier as the adapter, ie.:
+
+    >>> container.register_by_interface(IDao, TinyDbDao, qualifier=Bike, kwargs={...})
+    >>> container.register_by_interface(IAsyncDao, AsyncDaoAdapter, qualifier=Bike)
+
+    :param dao: (optional) the synchronous DAO to adapt
+    :param max_workers: (optional) size of the thread pool owned by the adapter
+    :param executor: (optional) an executor to share between adapters, instead of
+        the thread pool owned by the adapter
+    :param thread_safe: (optional) iff True, calls of the DAO aren't serialized
+    """
+
+    dao: IDao = Inject(get_qualifier=_get_context_qualifier)
+
+    def __init__(
+        self,
+        dao: IDao = None,
+        max_workers: int = 4,
+        executor: Executor = None,
+        thread_safe: bool = False,
+    ):
+        if dao is not None:
+            self.dao = dao
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = None if thread_safe else threading.Lock()
+
+    async def _run(self, function: t.Callable, *args, **kwargs) -> t.Any:
+        """Technical detail of running a blocking call in the thread pool."""
+        loop = asyncio.get_event_loop()
+        call = partial(function, *args, **kwargs)
+        if self._lock is not None:
+            call = partial(_call_locked, self._lock, call)
+        return await loop.run_in_executor(self._executor, call)
+
+    def close(self) -> None:
+        """Shuts down the thread pool iff it is owned by the adapter."""
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+
+    # lazy queries
+
+    def all(self) -> AsyncQueryChain:
+        """
+        Returns a query chain representing all objects.
+
+        Useful to explicitly denote counting, updating or removing all objects.
+        """
+        return AsyncQueryChain(self, self.dao.all())
+
+    def filter(self, predicate: IPredicate) -> AsyncQueryChain:
+        """
+        Filters out objects by the predicate specifying conditions that they
+        should met. Can be chained via `AsyncQueryChain` helper class.
+        """
+        return AsyncQueryChain(self, self.dao.filter(predicate))
+
+    def filter_by(self, id_: Id = None, ids: Ids = None) -> AsyncQueryChain:
+        """
+        Filters objects by a single id or a iterable of ids.
+        Can be chained with other queries via `AsyncQueryChain` helper.
+
+        :raises: InvalidQueryError iff both `id_` and `ids` arguments are defined.
+        """
+        return AsyncQueryChain(self, self.dao.filter_by(id_=id_, ids=ids))
+
+    # evaluating queries
+
+    async def get(self, id_: Id) -> t.Optional[Dto]:
+        """
+        Returns object of given id, or None iff not present.
+        Shortcut for querying via `AsyncDaoAdapter.all`.
+        """
+        return await self._run(self.dao.get, id_)
+
+    # instant commands
+
+    async def insert(self, **kwargs) -> Id:
+        """
+        Inserts the object into the collection.
+
+        :returns: id of the inserted object
+        """
+        return await self._run(self.dao.insert, **kwargs)
+
+    async def batch_insert(self, batch_kwargs: BatchOfKwargs) -> Ids:
+        """
+        Inserts multiple objects into the collection.
+
+        :returns: a iterable of ids
+        """
+        return await self._run(self.dao.batch_insert, batch_kwargs)
+
+    async def clear(self) -> None:
+        """Clears the collection."""
+        return await self._run(self.dao.clear)
@@ -0,0 +1,179 @@
+import time
+import typing as t
+
+from collections import OrderedDict
+
+from pca.data.errors import QueryErrors
+from pca.interfaces.dao import (
+    BatchOfDto,
+    BatchOfKwargs,
+    Dto,
+    Id,
+    IDao,
+    Ids,
+    IQueryChain,
+    Kwargs,
+)
+from pca.utils.sentinel import Sentinel
+
+from .abstract import (
+    AbstractDao,
+    QueryChain,
+)
+
+
+missing = Sentinel(module="pca.data.dao.caching", name="missing")
+
+
+class LruCache:
+    """
+    A mapping-like cache that keeps at most `maxsize` of the least recently used entries,
+    each of them for at most `ttl` seconds (iff `ttl` is defined).
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[t.Hashable, t.Tuple[float, t.Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: t.Hashable) -> t.Any:
+        """Returns the value cached under the key or `missing` iff absent or expired."""
+        try:
+            expires, value = self._entries[key]
+        except KeyError:
+            return missing
+        if expires and expires < time.monotonic():
+            del self._entries[key]
+            return missing
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: t.Hashable, value: t.Any) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl else 0
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: t.Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class CachingDao(AbstractDao[Id]):
+    """
+    Read-through cache in front of any DAO. Results of `get` are cached by the id and results
+    of queries are cached by their ids & predicates. Commands are delegated to the cached DAO
+    and invalidate the cache: entries of the affected ids and all the query results.
+
+    It can be registered instead of the cached DAO, under the same interface & qualifier:
+
+    >>> container.register_by_interface(
+    ...     IDao, CachingDao, qualifier=Bike, kwargs={"dao": TinyDbDao(container, ...)}
+    ... )
+
+    NB: only the commands going through the CachingDao invalidate the cache. Cached DTOs are
+    shared between the calls, so they should be treated as read-only.
+
+    :param dao: the DAO to be cached
+    :param maxsize: the number of cached entries (separately for ids & for queries)
+    :param ttl: (optional) the number of seconds an entry is valid for
+    """
+
+    def __init__(self, dao: IDao, maxsize: int = 1024, ttl: float = None):
+        self._dao = dao
+        self._get_cache = LruCache(maxsize=maxsize, ttl=ttl)
+        self._query_cache = LruCache(maxsize=maxsize, ttl=ttl)
+
+    def _delegate(self, query_chain: QueryChain) -> IQueryChain:
+        """Technical detail of building the same query on the cached DAO."""
+        delegated = self._dao.all()
+        for predicate in query_chain._filters or ():
+            delegated = delegated.filter(predicate)
+        if query_chain._ids:
+            delegated = delegated.filter_by(ids=query_chain._ids)
+        return delegated
+
+    def _invalidate(self, ids: Ids) -> None:
+        """Technical detail of dropping entries that might have been changed by a command."""
+        for id_ in ids:
+            self._get_cache.pop(id_)
+        self._query_cache.clear()
+
+    # evaluating queries
+
+    def get(self, id_: Id) -> t.Optional[Dto]:
+        """
+        Returns object of given id, or None iff not present.
+        Shortcut for querying via `QueryChain.all`.
+        """
+        dto = self._get_cache.get(id_)
+        if dto is missing:
+            dto = self._dao.get(id_)
+            self._get_cache.set(id_, dto)
+        return dto
+
+    def _resolve_filter(self, query_chain: QueryChain) -> BatchOfDto:
+        key = (
+            tuple(query_chain._ids) if query_chain._ids else None,
+            tuple(query_chain._filters) if query_chain._filters else None,
+        )
+        try:
+            dtos = self._query_cache.get(key)
+        except TypeError:
+            # a predicate with unhashable arguments can't be cached
+            return list(self._delegate(query_chain))
+        if dtos is missing:
+            dtos = list(self._delegate(query_chain))
+            self._query_cache.set(key, dtos)
+        return list(dtos)
+
+    def _resolve_get(self, dtos: BatchOfDto, id_: Id, nullable: bool = False) -> t.Optional[Dto]:
+        result = next((dto for dto in dtos if dto.id == id_), None)
+        if result is not None:
+            return result
+        elif nullable:
+            return
+        raise QueryErrors.NOT_FOUND.with_params(id=id_)
+
+    def _resolve_exists(self, query_chain: QueryChain) -> bool:
+        return bool(self._resolve_filter(query_chain))
+
+    def _resolve_count(self, query_chain: QueryChain) -> int:
+        return len(self._resolve_filter(query_chain))
+
+    # evaluating commands
+
+    def _resolve_update(self, query_chain: QueryChain, update: Kwargs) -> Ids:
+        ids = self._delegate(query_chain).update(**update)
+        self._invalidate(ids)
+        return ids
+
+    def _resolve_remove(self, query_chain: QueryChain) -> Ids:
+        if query_chain._is_trivial:
+            raise QueryErrors.UNRESTRICTED_REMOVE
+        ids = self._delegate(query_chain).remove()
+        self._invalidate(ids)
+        return ids
+
+    # instant commands
+
+    def insert(self, **kwargs) -> Id:
+        id_ = self._dao.insert(**kwargs)
+        self._invalidate((id_,))
+        return id_
+
+    def batch_insert(self, batch_kwargs: BatchOfKwargs) -> Ids:
+        ids = self._dao.batch_insert(batch_kwargs)
+        self._invalidate(ids)
+        return ids
+
+    def clear(self) -> None:
+        self._dao.clear()
+        self._get_cache.clear()
+        self._query_cache.clear()
@@ -0,0 +1,243 @@
+import os
+import pickle
+import threading
+import typing as t
+
+from itertools import count
+
+from pca.data.errors import QueryErrors
+from pca.interfaces.dao import (
+    BatchOfKwargs,
+    Dto,
+    Id,
+    Ids,
+    Kwargs,
+)
+from pca.utils.dependency_injection import (
+    Scopes,
+    scope,
+)
+
+from .abstract import QueryChain
+from .in_memory import InMemoryDao
+
+
+# kinds of records of the write-ahead log
+_INSERT = "i"
+_UPDATE = "u"
+_REMOVE = "r"
+_CLEAR = "c"
+
+Record = t.Tuple[t.Any, ...]
+
+
+@scope(Scopes.SINGLETON)
+class DurableInMemoryDao(InMemoryDao):
+    """
+    InMemoryDao which survives restarts: every command is appended as a compact record to
+    a write-ahead log, while all the queries are resolved in memory.
+
+    * group commit: records are flushed to the OS on each command, but the log is
+      `fsync`-ed once per `sync_every` records or at most `sync_interval` seconds after
+      the first unsynced record (by a background timer), whichever comes first; `sync`
+      forces it explicitly
+    * compaction: after `compact_every` records, the state is dumped with `snapshot` into
+      `snapshot_path` and the log is truncated
+    * replay: on construction, the snapshot is restored and the log is replayed on top of it
+
+    NB: replaying the records is idempotent, so a crash between dumping the snapshot and
+    truncating the log doesn't corrupt the state.
+    """
+
+    def __init__(
+        self,
+        log_path: str,
+        snapshot_path: str = None,
+        sync_every: int = 1,
+        sync_interval: float = None,
+        compact_every: int = None,
+        initial_content: BatchOfKwargs = None,
+        id_generator: t.Callable[[], Id] = None,
+    ):
+        self._log_path = log_path
+        self._snapshot_path = snapshot_path or f"{log_path}.snapshot"
+        self._sync_every = sync_every
+        self._sync_interval = sync_interval
+        self._compact_every = compact_every
+        self._pending = 0
+        self._records_since_snapshot = 0
+        # the log is synced by the timer thread too
+        self._lock = threading.RLock()
+        self._timer: t.Optional[threading.Timer] = None
+        super().__init__(id_generator=id_generator)
+        self._replay()
+        self._log = open(self._log_path, "ab")
+        if initial_content and not self._register:
+            self.batch_insert(initial_content)
+
+    # evaluating commands
+
+    def _resolve_update(self, query_chain: QueryChain, update: Kwargs) -> Ids:
+        ids = [dto.id for dto in self._resolve_filter(query_chain)]
+        if ids:
+            self._execute((_UPDATE, ids, update))
+            self._commit()
+        return ids
+
+    def _resolve_remove(self, query_chain: QueryChain) -> Ids:
+        if query_chain._is_trivial:
+            raise QueryErrors.UNRESTRICTED_REMOVE
+        ids = [dto.id for dto in self._resolve_filter(query_chain)]
+        if ids:
+            self._execute((_REMOVE, ids))
+            self._commit()
+        return ids
+
+    # instant commands
+
+    def insert(self, **kwargs) -> Id:
+        id_ = self._get_id()
+        self._execute((_INSERT, id_, kwargs))
+        self._commit()
+        return id_
+
+    def batch_insert(self, batch_kwargs: BatchOfKwargs) -> Ids:
+        """Inserts all the objects, committing the log once for the whole batch."""
+        ids = []
+        for kwargs in batch_kwargs:
+            id_ = self._get_id()
+            self._execute((_INSERT, id_, kwargs))
+            ids.append(id_)
+        self._commit()
+        return tuple(ids)
+
+    def clear(self) -> None:
+        self._execute((_CLEAR,))
+        self._commit()
+
+    # durability
+
+    def sync(self) -> None:
+        """Flushes all the pending records of the log to the disk."""
+        with self._lock:
+            self._cancel_timer()
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._pending = 0
+
+    def compact(self) -> None:
+        """Dumps the state into the snapshot file and truncates the log."""
+        with self._lock:
+            self.sync()
+            self.snapshot(self._snapshot_path)
+            self._log.close()
+            self._log = open(self._log_path, "wb")
+            self._records_since_snapshot = 0
+
+    def close(self) -> None:
+        """Syncs the pending records, stops the timer and closes the log."""
+        with self._lock:
+            if not self._log.closed:
+                self.sync()
+                self._log.close()
+
+    def restore(self, path: str) -> None:
+        """Restores the state from the snapshot and compacts it, so the log is discarded."""
+        super().restore(path)
+        self.compact()
+
+    def _execute(self, record: Record) -> None:
+        """
+        Technical detail of applying a command to the register and writing its record
+        to the log, without syncing it. The record is pickled before the register is changed,
+        so a command that can't be logged (i.e. of an unpicklable value) isn't applied either.
+        """
+        data = pickle.dumps(record, protocol=self._SNAPSHOT_PROTOCOL)
+        with self._lock:
+            self._apply(record)
+            self._log.write(data)
+            self._pending += 1
+            self._records_since_snapshot += 1
+
+    def _commit(self) -> None:
+        """
+        Technical detail of the group commit: flushes the log and syncs it iff the batch
+        is complete. Otherwise, the timer is started to sync it after `sync_interval`.
+        """
+        with self._lock:
+            if self._compact_every and self._records_since_snapshot >= self._compact_every:
+                self.compact()
+            elif self._pending >= self._sync_every:
+                self.sync()
+            else:
+                self._log.flush()
+                if self._sync_interval is not None and self._pending and self._timer is None:
+                    self._timer = threading.Timer(self._sync_interval, self._sync_pending)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+    def _sync_pending(self) -> None:
+        """Technical detail of syncing the log by the timer, unless it's been synced already."""
+        with self._lock:
+            if self._timer is threading.current_thread():
+                self._timer = None
+            if self._pending and not self._log.closed:
+                self.sync()
+
+    def _cancel_timer(self) -> None:
+        """Technical detail of stopping the timer, as the log is being synced anyway."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _replay(self) -> None:
+        """
+        Technical detail of restoring the state from the snapshot and the log. A torn record
+        at the end of the log (i.e. written partially during a crash) is truncated.
+        """
+        if os.path.exists(self._snapshot_path):
+            super().restore(self._snapshot_path)
+        if not os.path.exists(self._log_path):
+            return
+        next_id = next(self._id_generator)
+        valid_size = 0
+        with open(self._log_path, "rb") as log:
+            while True:
+                try:
+                    record = pickle.load(log)
+                except (EOFError, pickle.UnpicklingError):
+                    break
+                valid_size = log.tell()
+                id_ = self._apply(record)
+                if self._generate_id is None:
+                    next_id = max(next_id, id_ + 1)
+                self._records_since_snapshot += 1
+        self._id_generator = count(next_id)
+        if valid_size != os.path.getsize(self._log_path):
+            os.truncate(self._log_path, valid_size)
+
+    def _apply(self, record: Record) -> int:
+        """
+        Technical detail of applying a record of the log to the register.
+
+        :returns: the id of the inserted object or 0 iff the record isn't an insertion
+        """
+        kind = record[0]
+        if kind == _INSERT:
+            _, id_, kwargs = record
+            dto = Dto(kwargs)
+            dto.__id__ = id_
+            self._register[id_] = dto
+            return id_
+        elif kind == _UPDATE:
+            _, ids, update = record
+            for id_ in ids:
+                dto = self._register.get(id_)
+                if dto is not None:
+                    dto.update(update)
+        elif kind == _REMOVE:
+            for id_ in record[1]:
+                self._register.pop(id_, None)
+        elif kind == _CLEAR:
+            self._register.clear()
+        return 0
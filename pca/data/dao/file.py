@@ -28,3 +28,4 @@ class FileDao(InMemoryDao):
 
     # TODO Liskov violation, refactor needed
     _resolve_update = _resolve_remove = insert = batch_insert = clear = __not_implemented__
+    restore = __not_implemented__
@@ -1,3 +1,6 @@
+import mmap
+import os
+import pickle
 import typing as t
 
 from itertools import count
@@ -24,23 +27,41 @@ from .abstract import (
 
 @scope(Scopes.SINGLETON)
 class InMemoryDao(AbstractDao[int]):
-    def __init__(self, initial_content: BatchOfKwargs = None):
+
+    _SNAPSHOT_PROTOCOL: t.ClassVar[int] = pickle.HIGHEST_PROTOCOL
+
+    def __init__(
+        self, initial_content: BatchOfKwargs = None, id_generator: t.Callable[[], Id] = None
+    ):
+        """
+        :param initial_content: (optional) objects to be inserted at once
+        :param id_generator: (optional) a function generating ids of the inserted objects,
+            i.e. one of `pca.utils.ids` generators, so that the ids don't collide across
+            processes; a sequence starting from 1 by default
+        """
         self._register: t.Dict[int, Dto] = {}
         self._id_generator = count(1)
+        self._generate_id = id_generator
         if initial_content:
             self.batch_insert(initial_content)
 
     def _get_id(self) -> int:
+        if self._generate_id is not None:
+            return self._generate_id()
         return next(self._id_generator)
 
     def _resolve_filter(self, query_chain: QueryChain) -> BatchOfDto:
-        if query_chain._filters:
-            filter_ = query_chain._reduced_filter
-            filtered: BatchOfDto = (dto for dto in self._register.values() if filter_(dto))
+        if query_chain._ids:
+            # direct lookups instead of a scan, in the order of the ids
+            register = self._register
+            filtered: BatchOfDto = (
+                register[id_] for id_ in dict.fromkeys(query_chain._ids) if id_ in register
+            )
         else:
             filtered = self._register.values()
-        if query_chain._ids:
-            filtered = (dto for dto in filtered if dto.id in query_chain._ids)
+        if query_chain._filters:
+            filter_ = query_chain._reduced_filter
+            filtered = (dto for dto in filtered if filter_(dto))
         return [dto for dto in filtered if dto]
 
     def _resolve_get(self, dtos: BatchOfDto, id_: Id, nullable: bool = False) -> t.Optional[Dto]:
@@ -81,3 +102,48 @@ class InMemoryDao(AbstractDao[int]):
 
     def clear(self) -> None:
         self._register.clear()
+
+    # persistence of the state
+
+    def snapshot(self, path: str) -> None:
+        """
+        Dumps the whole state of the DAO (its contents & the state of its id generator)
+        into a file in a compact binary format. The file is replaced atomically, so a crash
+        during dumping won't corrupt the previous snapshot.
+        """
+        state = self._dump_state()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f, protocol=self._SNAPSHOT_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def restore(self, path: str) -> None:
+        """
+        Replaces the whole state of the DAO with the one dumped by `snapshot`. The file is
+        memory-mapped, so the state is loaded without copying the file into a buffer first.
+        """
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            state = pickle.loads(buffer)
+        self._load_state(state)
+
+    def _dump_state(self) -> t.Dict[str, t.Any]:
+        """Technical detail of gathering the state of the DAO as plain, picklable values."""
+        next_id = next(self._id_generator)
+        # `count` can't be inspected without being advanced, so it has to be recreated
+        self._id_generator = count(next_id)
+        return {
+            "next_id": next_id,
+            "register": [(id_, dict(dto)) for id_, dto in self._register.items()],
+        }
+
+    def _load_state(self, state: t.Dict[str, t.Any]) -> None:
+        """Technical detail of setting the state of the DAO gathered by `_dump_state`."""
+        register = {}
+        for id_, data in state["register"]:
+            dto = Dto(data)
+            dto.__id__ = id_
+            register[id_] = dto
+        self._register = register
+        self._id_generator = count(state["next_id"])
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pca.data.dao import (
+    AsyncDaoAdapter,
+    InMemoryDao,
+)
+from pca.data.predicate import where
+from pca.interfaces.dao import (
+    IAsyncDao,
+    IDao,
+)
+
+
+pred_not_a = ~(where("char") == "a")
+
+
+@pytest.fixture
+def content():
+    return [{"char": c, "is_a": c == "a"} for c in "abc"]
+
+
+@pytest.fixture
+def run():
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture
+def dao(content):
+    return InMemoryDao(initial_content=content)
+
+
+@pytest.fixture
+def adapter(dao):
+    adapter = AsyncDaoAdapter(dao, max_workers=2)
+    yield adapter
+    adapter.close()
+
+
+async def collect(query_chain):
+    return [dto async for dto in query_chain]
+
+
+class TestAsyncQueryChain:
+    def test_iteration(self, run, adapter: AsyncDaoAdapter, content):
+        assert run(collect(adapter.all())) == content
+
+    def test_filter(self, run, adapter: AsyncDaoAdapter):
+        query_chain = adapter.filter(pred_not_a).filter_by(ids=[1, 3])
+        assert run(collect(query_chain)) == [{"char": "c", "is_a": False}]
+        assert run(query_chain.count()) == 1
+        assert run(query_chain.exists())
+        assert run(adapter.filter(pred_not_a).get(3)) == {"char": "c", "is_a": False}
+
+    def test_update(self, run, adapter: AsyncDaoAdapter, dao: InMemoryDao):
+        assert run(adapter.filter(pred_not_a).update(char="z")) == [2, 3]
+        assert [dto["char"] for dto in dao.all()] == ["a", "z", "z"]
+
+    def test_remove(self, run, adapter: AsyncDaoAdapter, dao: InMemoryDao):
+        assert run(adapter.filter_by(id_=2).remove()) == [2]
+        assert dao.all().count() == 2
+
+
+class TestAsyncDaoAdapter:
+    def test_commands(self, run, adapter: AsyncDaoAdapter, dao: InMemoryDao):
+        assert run(adapter.insert(char="d")) == 4
+        assert run(adapter.batch_insert([{"char": "e"}])) == (5,)
+        assert run(adapter.get(5)) == {"char": "e"}
+        run(adapter.clear())
+        assert not dao.all().exists()
+
+    def test_concurrency(self, run, adapter: AsyncDaoAdapter):
+        async def count_concurrently():
+            return await asyncio.gather(*(adapter.all().count() for _ in range(5)))
+
+        assert run(count_concurrently()) == [3] * 5
+
+    @pytest.mark.parametrize("thread_safe, expected", [(False, 1), (True, 2)])
+    def test_serialization(self, run, dao: InMemoryDao, thread_safe, expected):
+        running = []
+        overlaps = []
+        lock = threading.Lock()
+
+        def insert(**kwargs):
+            with lock:
+                running.append(1)
+                overlaps.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+
+        dao.insert = insert
+        adapter = AsyncDaoAdapter(dao, max_workers=2, thread_safe=thread_safe)
+
+        async def insert_concurrently():
+            await asyncio.gather(*(adapter.insert(char=c) for c in "xy"))
+
+        run(insert_concurrently())
+        adapter.close()
+        assert max(overlaps) == expected
+
+    def test_injection(self, run, container, content):
+        container.register_by_interface(
+            IDao, InMemoryDao, qualifier="bikes", kwargs={"initial_content": content}
+        )
+        container.register_by_interface(IAsyncDao, AsyncDaoAdapter, qualifier="bikes")
+        adapter = container.find_by_interface(IAsyncDao, qualifier="bikes")
+        assert run(adapter.all().count()) == 3
+        adapter.close()
@@ -0,0 +1,130 @@
+import mock
+import pytest
+
+from pca.data.dao import (
+    CachingDao,
+    InMemoryDao,
+)
+from pca.data.dao.caching import (
+    LruCache,
+    missing,
+)
+from pca.data.errors import (
+    QueryError,
+    QueryErrors,
+)
+from pca.data.predicate import where
+from pca.domain import (
+    Entity,
+    Factory,
+    Repository,
+    SequenceId,
+)
+from pca.interfaces.dao import IDao
+
+
+pred_not_a = ~(where("char") == "a")
+
+
+@pytest.fixture
+def backend():
+    dao = InMemoryDao(initial_content=[{"char": c, "is_a": c == "a"} for c in "abc"])
+    return mock.Mock(wraps=dao)
+
+
+@pytest.fixture
+def dao(backend):
+    return CachingDao(backend)
+
+
+class TestLruCache:
+    def test_maxsize(self):
+        cache = LruCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+        # "b" has been the least recently used
+        assert cache.get("b") is missing
+        assert len(cache) == 2
+
+    @mock.patch("pca.data.dao.caching.time.monotonic")
+    def test_ttl(self, monotonic: mock.Mock):
+        monotonic.return_value = 10.0
+        cache = LruCache(ttl=5)
+        cache.set("a", 1)
+        monotonic.return_value = 14.0
+        assert cache.get("a") == 1
+        monotonic.return_value = 16.0
+        assert cache.get("a") is missing
+
+
+class TestCachingDao:
+    def test_get(self, dao: CachingDao, backend: mock.Mock):
+        assert dao.get(1) == {"char": "a", "is_a": True}
+        assert dao.get(1) == {"char": "a", "is_a": True}
+        assert dao.get(42) is None
+        assert dao.get(42) is None
+        assert backend.get.call_count == 2
+
+    def test_query(self, dao: CachingDao, backend: mock.Mock):
+        assert dao.filter(pred_not_a).count() == 2
+        assert [dto.id for dto in dao.filter(pred_not_a)] == [2, 3]
+        assert dao.filter(pred_not_a).exists()
+        assert dao.filter(pred_not_a).get(3) == {"char": "c", "is_a": False}
+        # the last `get` is a different query: filtered also by the id
+        assert backend.all.call_count == 2
+
+    def test_unhashable_query(self, dao: CachingDao, backend: mock.Mock):
+        predicate = where("char").test(lambda value, chars: value in chars, ["a", "b"])
+        with pytest.raises(TypeError):
+            hash(predicate)
+        assert dao.filter(predicate).count() == 2
+        assert dao.filter(predicate).count() == 2
+        assert backend.all.call_count == 2
+
+    def test_update_invalidates(self, dao: CachingDao):
+        assert dao.get(2)["char"] == "b"
+        assert dao.filter(where("char") == "z").count() == 0
+        assert dao.filter(pred_not_a).update(char="z") == [2, 3]
+        assert dao.get(2)["char"] == "z"
+        assert dao.filter(where("char") == "z").count() == 2
+
+    def test_remove_invalidates(self, dao: CachingDao):
+        assert dao.get(2)
+        assert dao.filter_by(id_=2).remove() == [2]
+        assert dao.get(2) is None
+        assert dao.all().count() == 2
+
+    def test_remove_all_error(self, dao: CachingDao):
+        with pytest.raises(QueryError) as error_info:
+            dao.all().remove()
+        assert error_info.value == QueryErrors.UNRESTRICTED_REMOVE
+
+    def test_insert_invalidates(self, dao: CachingDao):
+        assert dao.get(4) is None
+        assert dao.all().count() == 3
+        assert dao.insert(char="d") == 4
+        assert dao.get(4) == {"char": "d"}
+        assert dao.batch_insert([{"char": "e"}]) == (5,)
+        assert dao.all().count() == 5
+
+    def test_clear(self, dao: CachingDao):
+        assert dao.get(1)
+        dao.clear()
+        assert dao.get(1) is None
+        assert not dao.all().exists()
+
+
+class Bike(Entity):
+    id = SequenceId()
+    char: str
+    is_a: bool
+
+
+def test_registration(container, backend: mock.Mock):
+    container.register_by_interface(IDao, CachingDao, qualifier=Bike, kwargs={"dao": backend})
+    repo = Repository(container, Factory(Bike))
+    assert isinstance(repo.dao, CachingDao)
+    assert repo.find(1) == repo.find(1)
+    assert backend.get.call_count == 1
@@ -0,0 +1,143 @@
+import os
+import pickle
+
+import mock
+import pytest
+
+from pca.data.dao import DurableInMemoryDao
+from pca.data.predicate import where
+
+
+@pytest.fixture
+def content():
+    return [{"char": c, "is_a": c == "a"} for c in "abc"]
+
+
+@pytest.fixture
+def log_path(tmpdir):
+    return str(tmpdir.join("dao.log"))
+
+
+@pytest.fixture
+def dao(log_path, content):
+    dao = DurableInMemoryDao(log_path=log_path, initial_content=content)
+    yield dao
+    dao.close()
+
+
+def reopen(dao: DurableInMemoryDao, **kwargs) -> DurableInMemoryDao:
+    dao.close()
+    return DurableInMemoryDao(log_path=dao._log_path, **kwargs)
+
+
+class TestReplay:
+    def test_initial_content(self, dao: DurableInMemoryDao, content):
+        restarted = reopen(dao, initial_content=[{"char": "z"}])
+        # initial content is used only when there's no durable state
+        assert list(restarted.all()) == content
+
+    def test_commands(self, dao: DurableInMemoryDao):
+        dao.filter(where("char") == "b").update(char="z")
+        dao.filter_by(id_=1).remove()
+        dao.insert(char="d")
+        restarted = reopen(dao)
+        assert list(restarted.all()) == [
+            {"char": "z", "is_a": False},
+            {"char": "c", "is_a": False},
+            {"char": "d"},
+        ]
+        assert restarted.insert(char="e") == 5
+
+    def test_clear(self, dao: DurableInMemoryDao):
+        dao.clear()
+        restarted = reopen(dao)
+        assert list(restarted.all()) == []
+        assert restarted.insert(char="d") == 4
+
+    def test_torn_record(self, dao: DurableInMemoryDao, log_path, content):
+        dao.insert(char="d")
+        dao.close()
+        with open(log_path, "r+b") as f:
+            f.truncate(os.path.getsize(log_path) - 3)
+        restarted = DurableInMemoryDao(log_path=log_path)
+        assert list(restarted.all()) == content
+        # the torn record is discarded, so the log is appendable again
+        restarted.insert(char="e")
+        assert list(reopen(restarted).all()) == content + [{"char": "e"}]
+
+
+class TestGroupCommit:
+    @mock.patch("pca.data.dao.durable.os.fsync")
+    def test_sync_every(self, fsync: mock.Mock, log_path):
+        dao = DurableInMemoryDao(log_path=log_path, sync_every=3)
+        dao.insert(char="a")
+        dao.insert(char="b")
+        assert fsync.call_count == 0
+        dao.insert(char="c")
+        assert fsync.call_count == 1
+
+    @mock.patch("pca.data.dao.durable.os.fsync")
+    def test_batch(self, fsync: mock.Mock, log_path, content):
+        dao = DurableInMemoryDao(log_path=log_path)
+        dao.batch_insert(content)
+        assert fsync.call_count == 1
+
+    @mock.patch("pca.data.dao.durable.os.fsync")
+    def test_sync_interval(self, fsync: mock.Mock, log_path):
+        dao = DurableInMemoryDao(log_path=log_path, sync_every=100, sync_interval=0.01)
+        dao.insert(char="a")
+        # the record is flushed at once and synced by the timer, with no further commands
+        assert os.path.getsize(log_path) > 0
+        dao._timer.join(timeout=5)
+        assert fsync.call_count == 1
+        assert dao._timer is None
+        dao.close()
+
+    @mock.patch("pca.data.dao.durable.os.fsync")
+    def test_close_stops_timer(self, fsync: mock.Mock, log_path):
+        dao = DurableInMemoryDao(log_path=log_path, sync_every=100, sync_interval=60)
+        dao.insert(char="a")
+        timer = dao._timer
+        dao.close()
+        timer.join(timeout=5)
+        assert not timer.is_alive()
+        assert fsync.call_count == 1
+
+
+class TestCompaction:
+    def test_compact_every(self, log_path, content):
+        dao = DurableInMemoryDao(log_path=log_path, compact_every=4)
+        dao.batch_insert(content)
+        assert os.path.getsize(log_path) > 0
+        dao.insert(char="d")
+        assert os.path.getsize(log_path) == 0
+        assert os.path.exists(f"{log_path}.snapshot")
+        dao.insert(char="e")
+        assert get_chars(reopen(dao)) == ["a", "b", "c", "d", "e"]
+
+    def test_log_replayed_over_snapshot(self, dao: DurableInMemoryDao, log_path):
+        # simulates a crash between dumping the snapshot and truncating the log
+        dao.sync()
+        dao.snapshot(f"{log_path}.snapshot")
+        restarted = reopen(dao)
+        assert get_chars(restarted) == ["a", "b", "c"]
+        assert restarted.insert(char="d") == 4
+
+
+def get_chars(dao: DurableInMemoryDao):
+    return [dto["char"] for dto in dao.all()]
+
+
+class TestUnpicklableValues:
+    def test_insert(self, dao: DurableInMemoryDao, content):
+        with pytest.raises((pickle.PicklingError, AttributeError)):
+            dao.insert(char=lambda: "d")
+        assert dao.all().count() == 3
+        dao = reopen(dao)
+        assert list(dao.all()) == content
+        dao.close()
+
+    def test_update(self, dao: DurableInMemoryDao, content):
+        with pytest.raises((pickle.PicklingError, AttributeError)):
+            dao.filter_by(id_=1).update(char=lambda: "d")
+        assert dao.get(1) == content[0]
@@ -30,6 +30,12 @@ class TestConstruction:
         dao = InMemoryDao(initial_content=content)
         assert list(dao.all()) == content
 
+    def test_id_generator(self, mock_container, content):
+        ids = iter(["x", "y", "z"])
+        dao = InMemoryDao(initial_content=content, id_generator=lambda: next(ids))
+        assert get_ids(dao.all()) == ["x", "y", "z"]
+        assert dao.get("y") == content[1]
+
 
 class TestApi:
     @pytest.fixture
@@ -55,6 +61,10 @@ class TestApi:
     def test_filter_by_success(self, dao: InMemoryDao):
         assert list(dao.filter(pred_not_a).filter_by(id_=3)) == [{"char": "c", "is_a": False}]
 
+    def test_filter_by_ids(self, dao: InMemoryDao):
+        assert get_ids(dao.filter_by(ids=[3, 42, 1, 3])) == [3, 1]
+        assert get_ids(dao.filter(pred_not_a).filter_by(ids=[3, 1, 2])) == [3, 2]
+
     def test_filter_by_both_arguments_error(self, dao: InMemoryDao):
         with pytest.raises(QueryError):
             assert dao.all().filter_by(id_=3, ids=[3, 5])
@@ -184,3 +194,35 @@ class TestApi:
     def test_clear(self, dao: InMemoryDao):
         dao.clear()
         assert list(dao.all()) == []
+
+
+class TestSnapshot:
+    @pytest.fixture
+    def dao(self, mock_container, content):
+        return InMemoryDao(initial_content=content)
+
+    @pytest.fixture
+    def path(self, tmpdir):
+        return str(tmpdir.join("dao.snapshot"))
+
+    def test_restore_contents(self, dao: InMemoryDao, path):
+        dao.snapshot(path)
+        restored = InMemoryDao()
+        restored.restore(path)
+        assert list(restored.all()) == list(dao.all())
+        assert get_ids(restored.all()) == [1, 2, 3]
+        assert restored.get(2).id == 2
+
+    def test_restore_id_generator(self, dao: InMemoryDao, path):
+        dao.filter_by(id_=3).remove()
+        dao.snapshot(path)
+        restored = InMemoryDao()
+        restored.restore(path)
+        assert restored.insert(foo="bar") == 4
+        # snapshotting doesn't change the sequence of the original DAO
+        assert dao.insert(foo="bar") == 4
+
+    def test_restore_replaces_contents(self, dao: InMemoryDao, path):
+        InMemoryDao(initial_content=[{"foo": "bar"}]).snapshot(path)
+        dao.restore(path)
+        assert list(dao.all()) == [{"foo": "bar"}]
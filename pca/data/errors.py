@@ -17,3 +17,4 @@ class QueryErrors(ErrorCatalog):
     )
     NOT_FOUND = QueryError(hint="The query just didn't find any related entry.")
     IMMUTABLE_DAO = QueryError(hint="This DAO is immutable.")
+    UNKNOWN_REFERENCE = QueryError(hint="The entity has no reference of given name.")
@@ -4,7 +4,13 @@ from .entity import (  # noqa: F401
     NaturalId,
     SequenceId,
     Uuid4Id,
+    Uuid7Id,
 )
+from .relation import Reference  # noqa: F401
+from .relation import get_references  # noqa: F401
 from .repository import Factory  # noqa: F401
 from .repository import Repository  # noqa: F401
+from .slots import slotted  # noqa: F401
+from .unit_of_work import UnitOfWork  # noqa: F401
+from .unit_of_work import get_unit_of_work  # noqa: F401
 from .value_object import ValueObject  # noqa: F401
@@ -9,6 +9,7 @@ from uuid import (
 
 # from pca.utils.collections import frozen  # TODO
 from pca.utils.compat import GenericABCMeta
+from pca.utils.ids import uuid7
 
 
 # TODO #40. is entity module using dataclasses `field` or have its own API for `fields`?
@@ -18,6 +19,8 @@ field = dataclasses.field
 
 IdType = t.TypeVar("IdType")
 
+_TRANSIENT_ATTRS = frozenset(("__references__", "__di_container__", "__di_context__"))
+
 
 class Id(t.Generic[IdType], metaclass=GenericABCMeta):
     """
@@ -68,7 +71,8 @@ class SequenceId(AutoId[int]):
     has the same counter.
 
     NB: Doesn't take into account either collisions in the effect of any concurrency
-    nor any kind of synchronization between instances of ID field.
+    nor any kind of synchronization between instances of ID field. Use `AutoId` with one
+    of `pca.utils.ids` generators for ids unique across processes.
     """
 
     def __init__(self):
@@ -88,6 +92,16 @@ class Uuid4Id(AutoId[UUID]):
         super().__init__(generator=uuid4)
 
 
+class Uuid7Id(AutoId[UUID]):
+    """
+    Identity descriptor that auto-generates UUID v7, which are Universally Unique Identifiers
+    of 128-bit length ordered by the time of their generation.
+    """
+
+    def __init__(self):
+        super().__init__(generator=uuid7)
+
+
 class NaturalId(Id):
     """
     Descriptor describing identity of an entity as a tuple of its unique and
@@ -126,11 +140,25 @@ class Entity(t.Generic[IdType]):
       be normalized.
     """
 
+    __slots__ = ()
     __id_field_name__: t.ClassVar[str]
+    __extra_slots__: t.ClassVar[t.Tuple[str, ...]] = (
+        Id._ID_ATTR_NAME,
+        "__weakref__",
+        # technical attributes set by the repository & references
+        "__snapshot__",
+        "__references__",
+        "__di_container__",
+        "__di_context__",
+    )
+    """Names of the slots, besides the fields, of a class decorated with `slotted`."""
 
     @classmethod
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
+        if "__dataclass_fields__" in cls.__dict__:
+            # the class is recreated out of a dataclass already, i.e. by `slotted`
+            return
         id_fields = [(k, v) for k, v in cls.__dict__.items() if isinstance(v, Id)]
         if not getattr(cls, "__id_field_name__", None):
             assert len(id_fields) == 1, (
@@ -160,5 +188,51 @@ class Entity(t.Generic[IdType]):
         return self
 
     def __eq__(self, other) -> bool:
-        """Entity is identified by the value of its `Id` field."""
-        return isinstance(other, self.__class__) and other.__get_id__() == self.__get_id__()
+        """
+        Entity is identified by the value of its `Id` field. An entity without the id yet
+        (i.e. not added to a repository) is equal only to itself.
+        """
+        # the value is read directly, not via the descriptor of the field
+        id_ = getattr(self, Id._ID_ATTR_NAME, None)
+        if id_ is None:
+            return other is self
+        return isinstance(other, self.__class__) and getattr(other, Id._ID_ATTR_NAME, None) == id_
+
+    def __hash__(self) -> int:
+        """
+        Entity is hashed by the value of its `Id` field, so it can be a member of a set
+        or a key of a dict. An entity without the id yet is hashed by its identity.
+        NB: the id of an entity shouldn't change (nor be set) while it is one.
+        """
+        id_ = getattr(self, Id._ID_ATTR_NAME, None)
+        if id_ is None:
+            return object.__hash__(self)
+        return hash(id_)
+
+    def __getstate__(self) -> t.Dict[str, t.Any]:
+        """
+        Both the attributes and the slots are pickled (or copied), but the DI container &
+        context and the loaded references aren't: a container can't be pickled and a clone
+        should load the references on its own.
+        """
+        state = {
+            name: value
+            for name, value in getattr(self, "__dict__", {}).items()
+            if name not in _TRANSIENT_ATTRS
+        }
+        for klass in type(self).__mro__:
+            slots = vars(klass).get("__slots__", ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if name in _TRANSIENT_ATTRS or name in ("__dict__", "__weakref__"):
+                    continue
+                try:
+                    # the slot is read directly, as a field descriptor may shadow it
+                    state[name] = vars(klass)[name].__get__(self, klass)
+                except AttributeError:
+                    pass
+        return state
+
+    def __setstate__(self, state: t.Dict[str, t.Any]) -> None:
+        for name, value in state.items():
+            # supporting immutable entities
+            object.__setattr__(self, name, value)
@@ -0,0 +1,114 @@
+import typing as t
+
+from pca.utils.dependency_injection import (
+    Container,
+    DIErrors,
+    get_di_container,
+)
+
+from .entity import Entity
+
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from .repository import (
+        Factory,
+        Repository,
+    )
+
+
+_REFERENCES_REF = "__references__"
+
+
+class Reference:
+    """
+    Descriptor of a reference from an entity to another entity. The reference is kept
+    as the id of the referenced entity in a field of the owner, so only the id is persisted,
+    and the referenced entity is loaded lazily, on the first access, via a repository of its
+    class:
+
+    >>> class Rental(Entity):
+    ...     id = SequenceId()
+    ...     bike_id: int
+    ...     bike = Reference(Bike, "bike_id")
+
+    The loaded entity is kept on the owner as long as the id doesn't change. Assigning
+    an entity to the reference sets the id field as well.
+
+    The owner needs a DI container to load the referenced entity: `Repository` provides
+    its container to entities it creates or finds. Use `Repository.prefetch` to load
+    the references of many entities with a single query.
+    """
+
+    def __init__(self, entity: t.Type[Entity], id_field: str):
+        self.entity = entity
+        self.id_field = id_field
+        self._factory: t.Optional["Factory"] = None
+
+    def __set_name__(self, owner: t.Type, name: str) -> None:
+        self.owner = owner
+        self.name = name
+
+    def __get__(self, instance: t.Any, owner: t.Type) -> t.Optional[Entity]:
+        if instance is None:
+            return self
+        id_ = getattr(instance, self.id_field)
+        if id_ is None:
+            return None
+        loaded = self.get_loaded(instance, id_)
+        if loaded is not None:
+            return loaded
+        container = get_di_container(instance)
+        if not container:
+            raise DIErrors.NO_CONTAINER_PROVIDED.with_params(
+                class_name=instance.__class__.__qualname__, attribute=self.name
+            )
+        entity = self.get_repository(container).find(id_)
+        self.set_loaded(instance, entity)
+        return entity
+
+    def __set__(self, instance: t.Any, value: t.Optional[Entity]) -> None:
+        if value is None:
+            setattr(instance, self.id_field, None)
+            return
+        setattr(instance, self.id_field, value.__get_id__())
+        self.set_loaded(instance, value)
+
+    def get_loaded(self, instance: t.Any, id_: t.Any) -> t.Optional[Entity]:
+        """Returns the referenced entity iff it has been loaded for the current id."""
+        loaded = getattr(instance, _REFERENCES_REF, {}).get(self.name)
+        if loaded is not None and loaded[0] == id_:
+            return loaded[1]
+        return None
+
+    def set_loaded(self, instance: t.Any, entity: Entity) -> None:
+        """Keeps the referenced entity on the instance."""
+        references = getattr(instance, _REFERENCES_REF, None)
+        if references is None:
+            references = {}
+            # supporting immutable entities
+            object.__setattr__(instance, _REFERENCES_REF, references)
+        references[self.name] = (entity.__get_id__(), entity)
+
+    def get_repository(self, container: Container) -> "Repository":
+        """
+        Returns a repository of the referenced entities, using given container. The factory
+        of the repository is shared by all the repositories of the reference.
+        """
+        from .repository import (
+            Factory,
+            Repository,
+        )
+
+        if self._factory is None:
+            self._factory = Factory(self.entity)
+        return Repository(container, self._factory)
+
+
+def get_references(entity_class: t.Type[Entity]) -> t.Dict[str, Reference]:
+    """Returns all the references of the entity class, including the inherited ones."""
+    references = {}
+    for klass in reversed(entity_class.__mro__):
+        for name, value in vars(klass).items():
+            if isinstance(value, Reference):
+                references[name] = value
+    return references
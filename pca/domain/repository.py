@@ -1,20 +1,156 @@
+import copy
+import dataclasses
+import datetime
+import decimal
 import typing as t
-
-from dataclasses import asdict
+import uuid
 
 from pca.data.descriptors import reify
 from pca.data.errors import QueryErrors
 from pca.interfaces.dao import (
     Dto,
     IDao,
+    Ids,
 )
 from pca.interfaces.repository import (
     Id,
     IRepository,
 )
-from pca.utils.dependency_injection import Container
+from pca.utils.dependency_injection import (
+    Container,
+    DIContext,
+    set_di_context,
+)
+
+from .entity import (
+    AutoId,
+    Entity,
+)
+from .relation import get_references
+from .slots import has_instance_dict
+from .unit_of_work import get_unit_of_work
+
+
+_SNAPSHOT_REF = "__snapshot__"
+# values of these types are immutable, so deconstruction doesn't have to copy them
+_ATOMIC_TYPES = frozenset(
+    (
+        type(None),
+        bool,
+        int,
+        float,
+        complex,
+        str,
+        bytes,
+        decimal.Decimal,
+        uuid.UUID,
+        datetime.date,
+        datetime.datetime,
+        datetime.time,
+        datetime.timedelta,
+    )
+)
+
+Constructor = t.Callable[[Dto], Entity]
+Deconstructor = t.Callable[[Entity], Dto]
+
+
+def _deconstruct_value(value: t.Any) -> t.Any:
+    """
+    Technical detail of deconstructing a value of an entity field: nested entities are
+    replaced by their ids, other dataclasses are deconstructed to dicts, containers are copied
+    recursively and immutable values are not copied at all.
+    """
+    klass = value.__class__
+    if klass in _ATOMIC_TYPES:
+        return value
+    if isinstance(value, Entity):
+        return value.__get_id__()
+    if dataclasses.is_dataclass(value):
+        return {
+            field.name: _deconstruct_value(getattr(value, field.name))
+            for field in dataclasses.fields(value)
+        }
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        # a namedtuple
+        return klass(*(_deconstruct_value(v) for v in value))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return klass(_deconstruct_value(v) for v in value)
+    if isinstance(value, dict):
+        return klass((_deconstruct_value(k), _deconstruct_value(v)) for k, v in value.items())
+    return copy.deepcopy(value)
 
-from .entity import Entity
+
+def _compile_constructor(entity_class: t.Type[Entity]) -> t.Optional[Constructor]:
+    """
+    Technical detail of generating a fast constructor of the entity class: a function that
+    creates an instance without calling `__init__` and fills its fields from the DTO directly.
+    Returns None iff the class needs its `__init__`, i.e. it has a `__post_init__`.
+    """
+    if hasattr(entity_class, "__post_init__"):
+        return None
+    namespace = {
+        "_new": object.__new__,
+        "_cls": entity_class,
+        "_id_field": entity_class.__get_id_field__(),
+        "_MISSING": dataclasses.MISSING,
+    }
+    lines = ["def construct(dto):", "    entity = _new(_cls)"]
+    if has_instance_dict(entity_class):
+        lines.append("    d = entity.__dict__")
+        assignment = "    d[{name!r}] = {value}"
+    else:
+        # a slotted class
+        namespace["_set"] = object.__setattr__
+        assignment = "    _set(entity, {name!r}, {value})"
+    for field in dataclasses.fields(entity_class):
+        name = field.name
+        if field.default is not dataclasses.MISSING:
+            namespace[f"_default_{name}"] = field.default
+            value = f"dto.get({name!r}, _default_{name})"
+        elif field.default_factory is not dataclasses.MISSING:
+            namespace[f"_factory_{name}"] = field.default_factory
+            value = f"dto[{name!r}] if {name!r} in dto else _factory_{name}()"
+        else:
+            value = f"dto[{name!r}]"
+        lines.append(assignment.format(name=name, value=value))
+    id_field = namespace["_id_field"]
+    if type(id_field).__set_id__ is AutoId.__set_id__:
+        # the id given by the DAO is just set, a new one is generated only iff it's missing
+        lines += [
+            "    if dto.__id__ is None:",
+            "        _id_field.__set_id__(entity)",
+            "    else:",
+            "    " + assignment.format(name=id_field._ID_ATTR_NAME, value="dto.__id__"),
+        ]
+    else:
+        # i.e. NaturalId builds the id out of the fields
+        lines.append("    _id_field.__set_id__(entity, dto.__id__)")
+    lines.append("    return entity")
+    exec("\n".join(lines), namespace)
+    return namespace["construct"]
+
+
+def _compile_deconstructor(
+    entity_class: t.Type[Entity], mapped_fields: t.Optional[t.Collection[str]]
+) -> Deconstructor:
+    """
+    Technical detail of generating a deconstructor of the entity class: a function
+    extracting only the mapped fields, without iterating over the fields at each call.
+    """
+    names = [field.name for field in dataclasses.fields(entity_class)]
+    if mapped_fields:
+        names = [name for name in names if name in mapped_fields]
+    items = "".join(f"{name}=_value(entity.{name}), " for name in names)
+    source = (
+        "def deconstruct(entity):\n"
+        f"    dto = _Dto({items})\n"
+        "    dto.__id__ = entity.__get_id__()\n"
+        "    return dto\n"
+    )
+    namespace = {"_Dto": Dto, "_value": _deconstruct_value}
+    exec(source, namespace)
+    return namespace["deconstruct"]
 
 
 class Factory:
@@ -25,36 +161,81 @@ class Factory:
     """
 
     # TODO #39 integrate with some kind of validation at the flow (application) layer
-    # TODO #39 deconstruction of relations to other entites might consist of extraction their id
-    # TODO #40 currently it doesn't care if values are entites.
 
     def __init__(self, entity: t.Type[Entity], fields: t.Collection[str] = None):
         self.entity = entity
         self.mapped_fields = fields
+        self._deconstructors: t.Dict[t.Type[Entity], Deconstructor] = {}
+
+    @reify
+    def _fast_constructor(self) -> t.Optional[Constructor]:
+        return _compile_constructor(self.entity)
 
-    def construct(self, dto: Dto) -> Entity:
+    def construct(self, dto: Dto, trusted: bool = False) -> Entity:
         """
         Defines a way to construct (aka deserialize) an entity from data.
         Simple construction may just call class with data as kwargs. Complex cases may
         call another serializers to construct dependent types.
+
+        :param trusted: iff True, the data is trusted to be valid (i.e. it has been read from
+            the DAO), so the entity is constructed by a fast constructor compiled for the entity
+            class, bypassing its `__init__`. Entities with `__post_init__` are always
+            constructed with their `__init__`.
         """
+        if trusted and self._fast_constructor:
+            return self._fast_constructor(dto)
         entity = self.entity(**dto)
         # supporting immutable entities
         entity.__get_id_field__().__set_id__(entity, dto.__id__)
         return entity
 
+    def construct_many(self, dtos: t.Iterable[Dto], trusted: bool = False) -> t.List[Entity]:
+        """Constructs entities out of all the DTOs. See `Factory.construct`."""
+        if trusted and self._fast_constructor:
+            return list(map(self._fast_constructor, dtos))
+        return [self.construct(dto) for dto in dtos]
+
     def deconstruct(self, entity: Entity) -> Dto:
         """
         Defines a way to deconstruct (aka serialize) entity object into simple values.
         Simple deconstruction may just extract values from fields.
         Complex cases may need to use another factory to deconstruct objects of dependent types.
+
+        Only the mapped fields are deconstructed, by a function compiled once per entity
+        class. Nested entities are deconstructed to their ids.
         """
-        data = asdict(entity)
-        if self.mapped_fields:
-            data = {field: value for field, value in data.items() if field in self.mapped_fields}
-        dto = Dto(data)
-        dto.__id__ = entity.__get_id__()
-        return dto
+        try:
+            deconstructor = self._deconstructors[entity.__class__]
+        except KeyError:
+            deconstructor = self._deconstructors[entity.__class__] = _compile_deconstructor(
+                entity.__class__, self.mapped_fields
+            )
+        return deconstructor(entity)
+
+    def snapshot(self, entity: Entity) -> None:
+        """
+        Remembers the deconstructed state of the entity as the one known to the persistence
+        layer. `diff` compares the entity against the snapshot.
+        """
+        # supporting immutable entities
+        object.__setattr__(entity, _SNAPSHOT_REF, dict(self.deconstruct(entity)))
+
+    def diff(self, entity: Entity) -> Dto:
+        """
+        Deconstructs only the fields that have changed since the last snapshot of the entity,
+        or all of them iff there is no snapshot.
+        """
+        dto = self.deconstruct(entity)
+        snapshot = getattr(entity, _SNAPSHOT_REF, None)
+        if snapshot is None:
+            return dto
+        diff = Dto(
+            (field, value)
+            for field, value in dto.items()
+            if field not in snapshot or snapshot[field] != value
+        )
+        diff.__id__ = dto.__id__
+        return diff
 
 
 class Repository(IRepository[Id, Entity]):
@@ -88,6 +269,19 @@ class Repository(IRepository[Id, Entity]):
         """Proxy to entity class defined by the factory."""
         return self.factory.entity
 
+    @reify
+    def _has_references(self) -> bool:
+        return bool(get_references(self.entity))
+
+    def _provide_container(self, entity: Entity) -> Entity:
+        """
+        Technical detail of giving the container of the repo to the entity, so that
+        the entity can load its references.
+        """
+        if self._has_references:
+            set_di_context(entity, self.container, DIContext(interface=self.entity))
+        return entity
+
     def create(self, **kwargs) -> Entity:
         """
         Creates an object compatible with this repo. Uses repo's factory
@@ -95,12 +289,23 @@ class Repository(IRepository[Id, Entity]):
 
         NB: Does not inserts the object to the repo. Use `create_and_add` method for that.
         """
-        return self.factory.construct(Dto(kwargs))
+        return self._provide_container(self.factory.construct(Dto(kwargs)))
 
     def add(self, entity: Entity) -> Id:
-        """Adds the object to the repo to the underlying persistence layer via its DAO."""
+        """
+        Adds the object to the repo to the underlying persistence layer via its DAO.
+
+        NB: within a `UnitOfWork`, the object is inserted on commit, so its current id
+        is returned. The id given by the DAO is set to the object on commit.
+        """
+        unit_of_work = get_unit_of_work()
+        if unit_of_work is not None:
+            unit_of_work.register_new(self, entity)
+            return entity.__get_id__()
         kwargs = self.factory.deconstruct(entity)
-        return self.dao.insert(**kwargs)
+        id_ = self.dao.insert(**kwargs)
+        self.factory.snapshot(entity)
+        return id_
 
     def create_and_add(self, **kwargs) -> Entity:
         """Creates an object compatible with this repo and adds it to the collection."""
@@ -110,26 +315,203 @@ class Repository(IRepository[Id, Entity]):
         return entity
 
     def find(self, id_: Id) -> t.Optional[Entity]:
-        """Returns object of given id or None."""
+        """
+        Returns object of given id or None. Within a `UnitOfWork`, the same instance is
+        returned for the same id.
+        """
+        unit_of_work = get_unit_of_work()
+        if unit_of_work is not None:
+            entity = unit_of_work.get(self.entity, id_)
+            if entity is not None:
+                return entity
+            if unit_of_work.is_removed(self.entity, id_):
+                raise QueryErrors.NOT_FOUND.with_params(id=id_, entity=self.entity)
         dto = self.dao.get(id_)
         if not dto:
             raise QueryErrors.NOT_FOUND.with_params(id=id_, entity=self.entity)
-        entity = self.factory.construct(dto)
+        entity = self._provide_container(self.factory.construct(dto, trusted=True))
+        self.factory.snapshot(entity)
+        if unit_of_work is not None:
+            unit_of_work.register_clean(entity)
         return entity
 
+    def find_many(self, ids: t.Iterable[Id]) -> t.List[Entity]:
+        """
+        Returns objects of given ids, in the order of the ids, with a single query.
+        Within a `UnitOfWork`, already known objects aren't queried again.
+
+        :raises: QueryErrors.NOT_FOUND iff any of the objects hasn't been found; its `ids`
+            param lists all the missing ids
+        """
+        ids = list(ids)
+        found: t.Dict[Id, Entity] = {}
+        missing: t.List[Id] = []
+        unit_of_work = get_unit_of_work()
+        if unit_of_work is not None:
+            for id_ in ids:
+                entity = unit_of_work.get(self.entity, id_)
+                if entity is not None:
+                    found[id_] = entity
+                elif unit_of_work.is_removed(self.entity, id_):
+                    missing.append(id_)
+        to_query = [id_ for id_ in dict.fromkeys(ids) if id_ not in found and id_ not in missing]
+        if to_query:
+            dtos = list(self.dao.filter_by(ids=to_query))
+            for entity in self.factory.construct_many(dtos, trusted=True):
+                self._provide_container(entity)
+                self.factory.snapshot(entity)
+                if unit_of_work is not None:
+                    unit_of_work.register_clean(entity)
+                found[entity.__get_id__()] = entity
+        missing.extend(id_ for id_ in to_query if id_ not in found)
+        if missing:
+            raise QueryErrors.NOT_FOUND.with_params(ids=tuple(missing), entity=self.entity)
+        return [found[id_] for id_ in ids]
+
+    def prefetch(self, entities: t.Iterable[Entity], name: str) -> None:
+        """
+        Loads the entities referenced by the objects with the reference of given name,
+        with a single query for all the objects. Objects with the reference already loaded
+        are skipped.
+
+        :raises: QueryErrors.UNKNOWN_REFERENCE iff the entity has no reference of the name
+        :raises: QueryErrors.NOT_FOUND iff any of the referenced entities hasn't been found
+        """
+        reference = get_references(self.entity).get(name)
+        if reference is None:
+            raise QueryErrors.UNKNOWN_REFERENCE.with_params(name=name, entity=self.entity)
+        to_load = []
+        for entity in entities:
+            id_ = getattr(entity, reference.id_field)
+            if id_ is not None and reference.get_loaded(entity, id_) is None:
+                to_load.append((entity, id_))
+        if not to_load:
+            return
+        ids = list(dict.fromkeys(id_ for _, id_ in to_load))
+        repository = reference.get_repository(self.container)
+        loaded = dict(zip(ids, repository.find_many(ids)))
+        for entity, id_ in to_load:
+            reference.set_loaded(entity, loaded[id_])
+
+    def add_many(self, entities: t.Iterable[Entity]) -> Ids:
+        """
+        Adds the objects to the underlying persistence layer with a single batch insert.
+
+        NB: within a `UnitOfWork`, the objects are inserted on commit, so their current ids
+        are returned.
+        """
+        entities = list(entities)
+        unit_of_work = get_unit_of_work()
+        if unit_of_work is not None:
+            for entity in entities:
+                unit_of_work.register_new(self, entity)
+            return tuple(entity.__get_id__() for entity in entities)
+        return self._insert_many(entities)
+
+    def update_many(self, entities: t.Iterable[Entity]) -> None:
+        """
+        Updates the objects in the repo. Objects with the same changes are updated with
+        a single query. Within a `UnitOfWork`, the objects are updated on commit.
+        """
+        unit_of_work = get_unit_of_work()
+        if unit_of_work is not None:
+            for entity in entities:
+                unit_of_work.register_dirty(self, entity)
+            return
+        self._update_many(entities)
+
+    def remove_many(self, entities: t.Iterable[Entity]) -> None:
+        """
+        Removes the objects from the underlying persistence layer with a single query.
+        Within a `UnitOfWork`, the objects are removed on commit.
+
+        :raises: QueryErrors.NOT_FOUND iff any of the objects hasn't been found; its `ids`
+            param lists all the missing ids
+        """
+        unit_of_work = get_unit_of_work()
+        if unit_of_work is not None:
+            for entity in entities:
+                unit_of_work.register_removed(self, entity)
+            return
+        self._remove_many(entities)
+
+    def _insert_many(self, entities: t.Sequence[Entity]) -> Ids:
+        """Technical detail of inserting the objects in a batch."""
+        if not entities:
+            return ()
+        ids = self.dao.batch_insert([self.factory.deconstruct(entity) for entity in entities])
+        for entity in entities:
+            self.factory.snapshot(entity)
+        return ids
+
+    def _update_many(self, entities: t.Iterable[Entity]) -> None:
+        """
+        Technical detail of updating the objects with their changes only, grouping objects
+        with the same changes in a single query.
+        """
+        groups: t.Dict[t.Any, t.Tuple[Dto, t.List[Id]]] = {}
+        updated = []
+        for entity in entities:
+            update = self.factory.diff(entity)
+            if not update:
+                continue
+            updated.append(entity)
+            try:
+                # values equal but of different types (i.e. 1, 1.0 & True) can't share a query
+                key = frozenset((name, type(value), value) for name, value in update.items())
+            except TypeError:
+                # an unhashable value: the object has to be updated on its own
+                key = id(entity)
+            groups.setdefault(key, (update, []))[1].append(entity.__get_id__())
+        for update, ids in groups.values():
+            self.dao.filter_by(ids=ids).update(**update)
+        for entity in updated:
+            self.factory.snapshot(entity)
+
+    def _remove_many(self, entities: t.Iterable[Entity]) -> None:
+        """Technical detail of removing the objects with a single query."""
+        ids = [entity.__get_id__() for entity in entities]
+        if not ids:
+            return
+        removed = set(self.dao.filter_by(ids=ids).remove())
+        missing = tuple(id_ for id_ in ids if id_ not in removed)
+        if missing:
+            raise QueryErrors.NOT_FOUND.with_params(ids=missing, entity=self.entity)
+
     def contains(self, id_: Id) -> bool:
         """Checks whether an entity of given id is in the repo."""
+        unit_of_work = get_unit_of_work()
+        if unit_of_work is not None:
+            if unit_of_work.get(self.entity, id_) is not None:
+                return True
+            if unit_of_work.is_removed(self.entity, id_):
+                return False
         return self.dao.filter_by(id_=id_).exists()
 
     def update(self, entity: Entity) -> None:
-        """Updates the object in the repo."""
-        # TODO TBDL which layer should filter only changed fields of the entity
-        # TODO update = self.factory.diff(entity)
-        update = self.factory.deconstruct(entity)
+        """
+        Updates the object in the repo. Within a `UnitOfWork`, the object is updated
+        on commit.
+        """
+        unit_of_work = get_unit_of_work()
+        if unit_of_work is not None:
+            unit_of_work.register_dirty(self, entity)
+            return
+        update = self.factory.diff(entity)
+        if not update:
+            return
         self.dao.filter_by(id_=entity.__get_id__()).update(**update)
+        self.factory.snapshot(entity)
 
     def remove(self, entity: Entity) -> None:
-        """Removes the object from the underlying persistence layer via DAO."""
+        """
+        Removes the object from the underlying persistence layer via DAO. Within
+        a `UnitOfWork`, the object is removed on commit.
+        """
+        unit_of_work = get_unit_of_work()
+        if unit_of_work is not None:
+            unit_of_work.register_removed(self, entity)
+            return
         entity_id = entity.__get_id__()
         result = self.dao.filter_by(id_=entity_id).remove()
         if not result:  # entity hasn't been found in the DAO
@@ -0,0 +1,71 @@
+import dataclasses
+import typing as t
+
+
+T = t.TypeVar("T", bound=type)
+
+
+def has_instance_dict(klass: type) -> bool:
+    """Checks whether instances of the class have `__dict__`, i.e. aren't fully slotted."""
+    return any("__dict__" in vars(k) for k in klass.__mro__)
+
+
+def slotted(klass: T) -> T:
+    """
+    A class decorator that recreates a dataclass (i.e. an Entity or a ValueObject subclass)
+    with `__slots__` for its fields, so its instances have no `__dict__`. It cuts memory
+    footprint of the instances and speeds up the access to their attributes:
+
+    >>> @slotted
+    ... class Bike(Entity):
+    ...     id = SequenceId()
+    ...     frame_type: str
+
+    Besides the fields, slots for attributes named in the `__extra_slots__` of the class
+    (i.e. the id of an entity) are added.
+
+    NB: instances have no `__dict__` only iff all of the base classes are slotted. Entity
+    and ValueObject are, but a plain subclass of a slotted class is not.
+    """
+    assert dataclasses.is_dataclass(klass), f"{klass.__qualname__} is not a dataclass"
+    field_names = tuple(field.name for field in dataclasses.fields(klass))
+    inherited = set()
+    for base in klass.__mro__[1:]:
+        slots = vars(base).get("__slots__", ())
+        inherited.update((slots,) if isinstance(slots, str) else slots)
+        if "__weakref__" in vars(base):
+            inherited.add("__weakref__")
+    names = field_names + tuple(getattr(klass, "__extra_slots__", ()))
+    namespace = dict(vars(klass))
+    for name in field_names:
+        # default values of the fields are kept by the `__init__` generated by dataclass
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = tuple(name for name in dict.fromkeys(names) if name not in inherited)
+    new_klass = type(klass)(klass.__name__, klass.__bases__, namespace)
+    for value in namespace.values():
+        _rebind_class_cells(value, klass, new_klass)
+    return new_klass
+
+
+def _rebind_class_cells(value: t.Any, old: type, new: type) -> None:
+    """
+    Technical detail of pointing the closures of a method copied to the recreated class at
+    the new class: the `__class__` cell of zero-argument `super()` and the `cls` cell
+    of the methods generated by dataclass (i.e. frozen `__setattr__`).
+    """
+    if isinstance(value, (classmethod, staticmethod)):
+        value = value.__func__
+    elif isinstance(value, property):
+        for function in (value.fget, value.fset, value.fdel):
+            _rebind_class_cells(function, old, new)
+        return
+    for cell in getattr(value, "__closure__", None) or ():
+        try:
+            contents = cell.cell_contents
+        except ValueError:
+            # an empty cell
+            continue
+        if contents is old:
+            cell.cell_contents = new
@@ -1,4 +1,7 @@
 import dataclasses
+import pickle
+import typing as t
+import weakref
 
 import mock
 import pytest
@@ -9,7 +12,9 @@ from pca.domain.entity import (
     NaturalId,
     SequenceId,
     Uuid4Id,
+    Uuid7Id,
 )
+from pca.domain.slots import slotted
 
 
 @pytest.fixture(scope="session")
@@ -17,6 +22,12 @@ def data():
     return {"frame_type": "gravel", "wheel_type": "road"}
 
 
+@slotted
+class SlottedFrame(Entity):
+    id = SequenceId()
+    size: int
+
+
 def entity_constructor(id_field=None):
     id_field = id_field or SequenceId()
 
@@ -87,12 +98,82 @@ class TestEntity:
         entity_2.__set_id__(1)
         assert entity_1 == entity_2
 
+    def test_hashing(self, data):
+        Bike = entity_constructor()
+        entities = [Bike(**data).__set_id__(i) for i in (1, 2, 1)]
+        assert set(entities) == {entities[0], entities[1]}
+        assert {entities[0]: "a"}[entities[2]] == "a"
+        assert hash(entities[0]) == hash(1)
+
+    def test_hashing_without_id(self, data):
+        Bike = entity_constructor()
+        first, second = Bike(**data), Bike(**data)
+        assert first != second
+        assert first == first
+        assert len({first, second}) == 2
+        assert first != Bike(**data).__set_id__(1)
+
     def test_serialization(self, data):
         Bike = entity_constructor()
         entity = Bike(**data).__set_id__(1)
         assert dataclasses.asdict(entity) == data
 
 
+class TestSlotted:
+    @pytest.fixture
+    def klass(self):
+        @slotted
+        class Bike(Entity):
+            id = SequenceId()
+            frame_type: str
+            wheel_type: str = "road"
+            tags: t.List[str] = dataclasses.field(default_factory=list)
+
+        return Bike
+
+    def test_slots(self, klass, data):
+        entity = klass(frame_type="gravel").__set_id__()
+        assert not hasattr(entity, "__dict__")
+        assert entity.__get_id__() == 1
+        assert dataclasses.asdict(entity) == dict(data, tags=[])
+        assert klass.__get_id_field__().owner is klass
+        assert weakref.ref(entity)() is entity
+        with pytest.raises(AttributeError):
+            entity.color = "red"
+
+    def test_equality(self, klass):
+        entity = klass(frame_type="gravel").__set_id__(1)
+        assert entity == klass(frame_type="road").__set_id__(1)
+        assert entity != klass(frame_type="gravel").__set_id__(2)
+
+    def test_pickle(self):
+        entity = SlottedFrame(size=54).__set_id__(7)
+        clone = pickle.loads(pickle.dumps(entity))
+        assert clone == entity
+        assert clone.size == 54
+
+    def test_super(self):
+        class Frame(Entity):
+            id = SequenceId()
+
+            def describe(self):
+                return "frame"
+
+        @slotted
+        class RoadFrame(Frame):
+            id = SequenceId()
+            size: int
+
+            def describe(self):
+                return f"road {super().describe()} of size {self.size}"
+
+        assert RoadFrame(size=54).describe() == "road frame of size 54"
+
+    def test_not_a_dataclass(self):
+        with pytest.raises(AssertionError):
+            slotted(object)
+
+
 class TestAutoId:
     def test_value_generation(self, data):
         id_value = 42
@@ -150,3 +231,11 @@ class TestUuid4Id:
         id_value = "other-value"
         entity.__set_id__(id_value)
         assert entity.__get_id__() == id_value
+
+
+class TestUuid7Id:
+    def test_value_generation(self, data):
+        Bike = entity_constructor(Uuid7Id())
+        ids = [Bike(**data).__set_id__().__get_id__() for _ in range(3)]
+        assert all(id_.version == 7 for id_ in ids)
+        assert ids == sorted(set(ids))
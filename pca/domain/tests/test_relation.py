@@ -0,0 +1,146 @@
+import copy
+import dataclasses
+import pickle
+import platform
+import typing as t
+
+import mock
+import pytest
+
+from pca.data.dao import InMemoryDao
+from pca.data.errors import QueryErrors
+from pca.domain.entity import (
+    Entity,
+    SequenceId,
+)
+from pca.domain.relation import (
+    Reference,
+    get_references,
+)
+from pca.domain.repository import (
+    Factory,
+    Repository,
+)
+from pca.exceptions import (
+    ConfigError,
+    QueryError,
+)
+from pca.interfaces.dao import IDao
+from pca.utils.dependency_injection import (
+    DIErrors,
+    get_di_container,
+)
+
+
+pytestmark = pytest.mark.skipif(platform.python_implementation() == "PyPy", reason="TODO #80")
+
+
+class Bike(Entity):
+    id = SequenceId()
+    frame_type: str
+
+
+class Rental(Entity):
+    id = SequenceId()
+    bike_id: t.Optional[int]
+    bike = Reference(Bike, "bike_id")
+
+
+@pytest.fixture
+def bike_dao(container):
+    dao = mock.Mock(wraps=InMemoryDao())
+    container.register_by_interface(IDao, lambda: dao, qualifier=Bike)
+    return dao
+
+
+@pytest.fixture
+def repo(container, bike_dao):
+    container.register_by_interface(IDao, InMemoryDao, qualifier=Rental)
+    return Repository(container, Factory(Rental))
+
+
+@pytest.fixture
+def bike_ids(bike_dao):
+    ids = bike_dao.batch_insert([{"frame_type": "gravel"}, {"frame_type": "road"}])
+    bike_dao.reset_mock()
+    return ids
+
+
+class TestReference:
+    def test_references(self):
+        assert get_references(Rental) == {"bike": Rental.bike}
+        assert get_references(Bike) == {}
+        assert "bike" not in {field.name for field in dataclasses.fields(Rental)}
+
+    def test_lazy_loading(self, repo, bike_dao, bike_ids):
+        rental = repo.find(repo.add(Rental(bike_id=bike_ids[0])))
+        bike_dao.get.assert_not_called()
+        assert rental.bike.frame_type == "gravel"
+        assert rental.bike is rental.bike
+        bike_dao.get.assert_called_once_with(bike_ids[0])
+        assert repo.factory.deconstruct(rental) == {"bike_id": bike_ids[0]}
+
+    def test_id_change(self, repo, bike_ids):
+        rental = repo.create(bike_id=bike_ids[0])
+        assert rental.bike.frame_type == "gravel"
+        rental.bike_id = bike_ids[1]
+        assert rental.bike.frame_type == "road"
+        rental.bike_id = None
+        assert rental.bike is None
+
+    def test_assignment(self, repo, bike_dao, bike_ids):
+        rental = repo.create(bike_id=None)
+        bike = Bike(frame_type="city").__set_id__()
+        rental.bike = bike
+        assert rental.bike_id == bike.id
+        assert rental.bike is bike
+        bike_dao.get.assert_not_called()
+
+    @pytest.mark.parametrize("clone", [copy.deepcopy, lambda e: pickle.loads(pickle.dumps(e))])
+    def test_clone(self, repo, bike_ids, clone):
+        rental = repo.find(repo.add(Rental(bike_id=bike_ids[0])))
+        assert rental.bike.frame_type == "gravel"
+        cloned = clone(rental)
+        assert cloned == rental
+        assert cloned.bike_id == bike_ids[0]
+        assert repo.factory.deconstruct(cloned) == {"bike_id": bike_ids[0]}
+        assert get_di_container(cloned) is None
+        assert not hasattr(cloned, "__references__")
+
+    def test_no_container(self, bike_ids):
+        rental = Rental(bike_id=bike_ids[0])
+        with pytest.raises(ConfigError) as error_info:
+            assert rental.bike
+        assert error_info.value == DIErrors.NO_CONTAINER_PROVIDED
+        assert error_info.value.params == {"class_name": "Rental", "attribute": "bike"}
+
+
+class TestPrefetch:
+    def test_prefetch(self, repo, bike_dao, bike_ids):
+        ids = repo.add_many(Rental(bike_id=bike_ids[i]) for i in (0, 1, 0))
+        rentals = repo.find_many(ids) + [repo.create(bike_id=None)]
+        repo.prefetch(rentals, "bike")
+        bike_dao.filter_by.assert_called_once_with(ids=[bike_ids[0], bike_ids[1]])
+        assert [rental.bike and rental.bike.frame_type for rental in rentals] == [
+            "gravel",
+            "road",
+            "gravel",
+            None,
+        ]
+        assert rentals[0].bike is rentals[2].bike
+        repo.prefetch(rentals, "bike")
+        bike_dao.filter_by.assert_called_once()
+        bike_dao.get.assert_not_called()
+
+    def test_prefetch_missing(self, repo, bike_ids):
+        rentals = [repo.create(bike_id=bike_ids[0]), repo.create(bike_id=42)]
+        with pytest.raises(QueryError) as error_info:
+            repo.prefetch(rentals, "bike")
+        assert error_info.value == QueryErrors.NOT_FOUND
+        assert error_info.value.params == {"ids": (42,), "entity": Bike}
+
+    def test_prefetch_unknown(self, repo):
+        with pytest.raises(QueryError) as error_info:
+            repo.prefetch([], "owner")
+        assert error_info.value == QueryErrors.UNKNOWN_REFERENCE
+        assert error_info.value.params == {"name": "owner", "entity": Rental}
@@ -1,5 +1,6 @@
 import dataclasses
 import platform
+import typing as t
 
 import pytest
 
@@ -7,12 +8,14 @@ from pca.data.dao import InMemoryDao
 from pca.data.errors import QueryErrors
 from pca.domain.entity import (
     Entity,
+    NaturalId,
     SequenceId,
 )
 from pca.domain.repository import (
     Factory,
     Repository,
 )
+from pca.domain.slots import slotted
 from pca.exceptions import (
     ConfigError,
     QueryError,
@@ -67,6 +70,78 @@ class TestFactory:
         assert entity.frame_type == "gravel"
         assert entity.wheel_type == "road"
 
+    def test_trusted_construction(self, dto, mocker):
+        factory = Factory(Bike)
+        init = mocker.spy(Bike, "__init__")
+        entity = factory.construct(dto, trusted=True)
+        init.assert_not_called()
+        assert entity == factory.construct(dto)
+        assert dataclasses.asdict(entity) == dto
+        assert entity.id == 17
+
+    def test_trusted_construction_defaults(self):
+        # Entity subclasses are dataclasses already; decorating them again would lose
+        # the default factory
+        class Trike(Entity):
+            id = SequenceId()
+            frame_type: str
+            wheel_type: str = "road"
+            tags: t.List[str] = dataclasses.field(default_factory=list)
+
+        entities = Factory(Trike).construct_many([Dto(frame_type="gravel")], trusted=True)
+        assert dataclasses.asdict(entities[0]) == {
+            "frame_type": "gravel",
+            "wheel_type": "road",
+            "tags": [],
+        }
+        # a new id is generated iff the DTO has none
+        assert entities[0].id is not None
+
+    def test_trusted_construction_natural_id(self):
+        @dataclasses.dataclass
+        class Frame(Entity):
+            id = NaturalId("serial", "size")
+            serial: str
+            size: int
+
+        entity = Factory(Frame).construct(Dto(serial="X1", size=54), trusted=True)
+        assert entity.id == ("X1", 54)
+
+    def test_trusted_construction_post_init(self, dto):
+        @dataclasses.dataclass
+        class Trike(Entity):
+            id = SequenceId()
+            frame_type: str
+            wheel_type: str
+
+            def __post_init__(self):
+                self.frame_type = self.frame_type.upper()
+
+        factory = Factory(Trike)
+        assert factory.construct(dto, trusted=True).frame_type == "GRAVEL"
+        assert factory._fast_constructor is None
+
+    def test_trusted_construction_slotted(self, dto):
+        @slotted
+        class Trike(Entity):
+            id = SequenceId()
+            frame_type: str
+            wheel_type: str
+            color: str = "black"
+
+        factory = Factory(Trike)
+        entity = factory.construct(dto, trusted=True)
+        assert not hasattr(entity, "__dict__")
+        assert entity.id == 17
+        assert entity.color == "black"
+        factory.snapshot(entity)
+        entity.color = "red"
+        assert factory.diff(entity) == {"color": "red"}
+
+    def test_construct_many(self, dto, data):
+        entities = Factory(Bike).construct_many([dto, dto])
+        assert [dataclasses.asdict(entity) for entity in entities] == [data, data]
+
     def test_deconstruction(self, entity, data):
         factory = Factory(Bike)
         result = factory.deconstruct(entity)
@@ -79,6 +154,48 @@ class TestFactory:
         assert result == {"wheel_type": "road"}
         assert result.id == entity.id
 
+    def test_deconstruction_nested(self, entity):
+        @dataclasses.dataclass
+        class Wheel:
+            size: int
+
+        @dataclasses.dataclass
+        class Rental(Entity):
+            id = SequenceId()
+            bike: Bike
+            wheels: t.List[Wheel]
+            tags: t.Dict[str, t.List[str]]
+
+        entity.__set_id__(17)
+        rental = Rental(bike=entity, wheels=[Wheel(28), Wheel(29)], tags={"a": ["b"]})
+        result = Factory(Rental).deconstruct(rental)
+        assert result == {"bike": 17, "wheels": [{"size": 28}, {"size": 29}], "tags": {"a": ["b"]}}
+        assert result.id == rental.id
+        assert result["tags"]["a"] is not rental.tags["a"]
+
+    def test_deconstructor_cached(self, entity):
+        factory = Factory(Bike)
+        factory.deconstruct(entity)
+        deconstructor = factory._deconstructors[Bike]
+        factory.deconstruct(entity)
+        assert factory._deconstructors == {Bike: deconstructor}
+
+    def test_diff(self, dto):
+        factory = Factory(Bike)
+        entity = factory.construct(dto)
+        factory.snapshot(entity)
+        assert factory.diff(entity) == {}
+        entity.wheel_type = "gravel"
+        result = factory.diff(entity)
+        assert result == {"wheel_type": "gravel"}
+        assert result.id == 17
+        factory.snapshot(entity)
+        assert factory.diff(entity) == {}
+
+    def test_diff_without_snapshot(self, entity, data):
+        factory = Factory(Bike)
+        assert factory.diff(entity) == data
+
 
 class TestConstruction:
     @pytest.fixture
@@ -163,6 +280,78 @@ class TestApi:
         repo.update(entity)
         assert dao.get(id_) == {"frame_type": "road", "wheel_type": "road"}
 
+    def test_update_diff(self, data, repo: Repository, dao: IDao, mocker):
+        id_ = dao.insert(**data)
+        entity = repo.find(id_)
+        update = mocker.spy(dao, "_resolve_update")
+        repo.update(entity)
+        update.assert_not_called()
+        entity.wheel_type = "gravel"
+        repo.update(entity)
+        update.assert_called_once_with(mocker.ANY, {"wheel_type": "gravel"})
+        repo.update(entity)
+        assert update.call_count == 1
+
+    def test_find_many(self, data, repo: Repository, dao: IDao):
+        ids = dao.batch_insert([data, {"frame_type": "road", "wheel_type": "road"}])
+        entities = repo.find_many([ids[1], ids[0], ids[1]])
+        assert [entity.id for entity in entities] == [ids[1], ids[0], ids[1]]
+        assert entities[1].frame_type == "gravel"
+        assert repo.find_many([]) == []
+
+    def test_find_many_missing(self, data, repo: Repository, dao: IDao):
+        id_ = dao.insert(**data)
+        with pytest.raises(QueryError) as error_info:
+            repo.find_many([42, id_, 43])
+        assert error_info.value == QueryErrors.NOT_FOUND
+        assert error_info.value.params == {"ids": (42, 43), "entity": Bike}
+
+    def test_add_many(self, data, repo: Repository, dao: IDao, mocker):
+        batch_insert = mocker.spy(dao, "batch_insert")
+        ids = repo.add_many([Bike(**data), Bike(**data)])
+        batch_insert.assert_called_once()
+        assert [dao.get(id_) for id_ in ids] == [data, data]
+
+    def test_update_many(self, data, repo: Repository, dao: IDao, mocker):
+        ids = dao.batch_insert([data, data, data])
+        entities = repo.find_many(ids)
+        entities[0].frame_type = entities[1].frame_type = "road"
+        entities[2].wheel_type = "gravel"
+        update = mocker.spy(dao, "_resolve_update")
+        repo.update_many(entities)
+        assert update.call_count == 2
+        assert [dao.get(id_) for id_ in ids] == [
+            {"frame_type": "road", "wheel_type": "road"},
+            {"frame_type": "road", "wheel_type": "road"},
+            {"frame_type": "gravel", "wheel_type": "gravel"},
+        ]
+        repo.update_many(entities)
+        assert update.call_count == 2
+
+    def test_update_many_types(self, data, repo: Repository, dao: IDao):
+        ids = dao.batch_insert([data, data, data])
+        entities = repo.find_many(ids)
+        for entity, value in zip(entities, (1, 1.0, True)):
+            entity.frame_type = value
+        repo.update_many(entities)
+        values = [dao.get(id_)["frame_type"] for id_ in ids]
+        assert [type(value) for value in values] == [int, float, bool]
+
+    def test_remove_many(self, data, repo: Repository, dao: IDao):
+        ids = dao.batch_insert([data, data, data])
+        repo.remove_many(repo.find_many(ids[:2]))
+        assert [dto.id for dto in dao.all()] == [ids[2]]
+
+    def test_remove_many_missing(self, data, repo: Repository, dao: IDao):
+        ids = dao.batch_insert([data, data])
+        entities = repo.find_many(ids)
+        repo.remove(entities[1])
+        with pytest.raises(QueryError) as error_info:
+            repo.remove_many(entities)
+        assert error_info.value == QueryErrors.NOT_FOUND
+        assert error_info.value.params == {"ids": (ids[1],), "entity": Bike}
+        assert not dao.all().exists()
+
     def test_remove_success(self, data, repo: Repository, dao: IDao):
         id_ = dao.insert(**data)
         entity = repo.find(id_)
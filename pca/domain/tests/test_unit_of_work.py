@@ -0,0 +1,148 @@
+import dataclasses
+import platform
+
+import mock
+import pytest
+
+from pca.data.dao import InMemoryDao
+from pca.data.errors import QueryErrors
+from pca.domain.entity import (
+    Entity,
+    SequenceId,
+)
+from pca.domain.repository import (
+    Factory,
+    Repository,
+)
+from pca.domain.unit_of_work import (
+    UnitOfWork,
+    get_unit_of_work,
+)
+from pca.exceptions import QueryError
+from pca.interfaces.dao import IDao
+
+
+pytestmark = pytest.mark.skipif(platform.python_implementation() == "PyPy", reason="TODO #80")
+
+
+@dataclasses.dataclass
+class Bike(Entity):
+    id = SequenceId()
+    frame_type: str
+    wheel_type: str
+
+
+@pytest.fixture
+def data():
+    return {"frame_type": "gravel", "wheel_type": "road"}
+
+
+@pytest.fixture
+def dao(container):
+    container.register_by_interface(IDao, InMemoryDao, qualifier=Bike)
+    dao = container.find_by_interface(IDao, qualifier=Bike)
+    return mock.Mock(wraps=dao)
+
+
+@pytest.fixture
+def repo(container, dao):
+    repo = Repository(container, Factory(Bike))
+    repo.dao = dao
+    return repo
+
+
+class TestUnitOfWork:
+    def test_current(self):
+        assert get_unit_of_work() is None
+        with UnitOfWork() as unit_of_work:
+            assert get_unit_of_work() is unit_of_work
+            with UnitOfWork() as nested:
+                assert get_unit_of_work() is nested
+            assert get_unit_of_work() is unit_of_work
+        assert get_unit_of_work() is None
+
+    def test_identity_map(self, data, repo, dao):
+        id_ = dao.insert(**data)
+        with UnitOfWork():
+            entity = repo.find(id_)
+            assert repo.find(id_) is entity
+            assert repo.contains(id_)
+        dao.get.assert_called_once_with(id_)
+        assert repo.find(id_) is not entity
+
+    def test_commit(self, data, repo, dao):
+        ids = dao.batch_insert([data, data, data])
+        dao.reset_mock()
+        with UnitOfWork():
+            new_1 = repo.create(**data)
+            new_2 = repo.create(frame_type="road", wheel_type="road")
+            repo.add(new_1)
+            repo.add(new_2)
+            dirty = repo.find(ids[0])
+            for frame_type in ("road", "mtb", "city"):
+                dirty.frame_type = frame_type
+                repo.update(dirty)
+            repo.remove(repo.find(ids[1]))
+            repo.remove(repo.find(ids[2]))
+            assert not repo.contains(ids[1])
+            dao.batch_insert.assert_not_called()
+            dao.filter_by.assert_not_called()
+
+        dao.batch_insert.assert_called_once()
+        assert dao.filter_by.call_count == 2  # a single update & a single removal
+        assert dao.get(ids[0]) == {"frame_type": "city", "wheel_type": "road"}
+        assert not dao.filter_by(ids=ids[1:]).exists()
+        assert dao.get(new_2.id) == {"frame_type": "road", "wheel_type": "road"}
+        assert dao.all().count() == 3
+
+    def test_new_entity_removed(self, data, repo, dao):
+        with UnitOfWork():
+            entity = repo.create(**data)
+            repo.add(entity)
+            repo.update(entity)
+            repo.remove(entity)
+        assert dao.all().count() == 0
+
+    def test_dirty_entities_removed(self, data, repo, dao):
+        ids = dao.batch_insert([data, data, data])
+        with UnitOfWork():
+            entities = repo.find_many(ids)
+            dao.reset_mock()
+            for entity in entities:
+                entity.frame_type = "road"
+            repo.update_many(entities + entities)
+            repo.remove_many(entities[:2])
+        assert dao.filter_by.call_count == 2  # a single update & a single removal
+        assert list(dao.all()) == [dict(data, frame_type="road")]
+
+    def test_removed_entity_not_found(self, data, repo, dao):
+        id_ = dao.insert(**data)
+        with pytest.raises(QueryError) as error_info:
+            with UnitOfWork():
+                entity = repo.find(id_)
+                repo.remove(entity)
+                repo.find(id_)
+        assert error_info.value == QueryErrors.NOT_FOUND
+        assert dao.get(id_) == data
+
+    def test_rollback(self, data, repo, dao):
+        id_ = dao.insert(**data)
+        with pytest.raises(ValueError):
+            with UnitOfWork():
+                entity = repo.find(id_)
+                entity.frame_type = "road"
+                repo.update(entity)
+                repo.add(repo.create(**data))
+                raise ValueError
+        assert dao.get(id_) == data
+        assert dao.all().count() == 1
+
+    def test_remove_missing(self, data, repo, dao):
+        id_ = dao.insert(**data)
+        entity = repo.find(id_)
+        dao.filter_by(id_=id_).remove()
+        with pytest.raises(QueryError) as error_info:
+            with UnitOfWork():
+                repo.remove(entity)
+        assert error_info.value == QueryErrors.NOT_FOUND
+        assert error_info.value.params == {"ids": (id_,), "entity": Bike}
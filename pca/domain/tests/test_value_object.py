@@ -0,0 +1,178 @@
+import copy
+import dataclasses
+import pickle
+import typing as t
+
+import mock
+import pytest
+
+from pca.domain.slots import slotted
+from pca.domain.value_object import ValueObject
+
+
+class Time(ValueObject):
+    hour: int
+    minute: int = 0
+
+
+class Slot(ValueObject):
+    start: Time
+    tags: t.Tuple[str, ...] = ()
+    notes: t.List[str] = dataclasses.field(default_factory=list, compare=False, hash=False)
+
+
+@slotted
+class SlottedTime(ValueObject):
+    hour: int
+    minute: int = 0
+
+
+class TestValueObject:
+    def test_repr(self):
+        assert repr(Time(12)) == "Time(hour=12)"
+        assert repr(Time(12, 30)) == "Time(hour=12, minute=30)"
+
+    def test_construction(self):
+        slot = Slot(Time(12))
+        assert slot.start == Time(hour=12, minute=0)
+        assert slot.tags == ()
+        assert slot.notes == [] and slot.notes is not Slot(Time(12)).notes
+        assert Slot(Time(12), notes=["a"]).notes == ["a"]
+        with pytest.raises(TypeError):
+            Time()
+
+    def test_equality(self):
+        assert Time(12) == Time(12, 0)
+        assert Time(12) != Time(12, 30)
+        assert Time(12) != SlottedTime(12)
+        assert Slot(Time(12), notes=["a"]) == Slot(Time(12))
+
+    def test_replace(self):
+        time = Time(12, 30)
+        hash(time)
+        replaced = time._replace(minute=45)
+        assert replaced == Time(12, 45)
+        assert time == Time(12, 30)
+        assert hash(replaced) == hash(Time(12, 45))
+        assert time._replace() == time
+        with pytest.raises(TypeError):
+            time._replace(second=1)
+
+    def test_post_init(self):
+        class Hour(ValueObject):
+            value: int
+
+            def __post_init__(self):
+                if not 0 <= self.value < 24:
+                    raise ValueError(self.value)
+
+        assert Hour(12)._replace(value=13) == Hour(13)
+        with pytest.raises(ValueError):
+            Hour(25)
+        with pytest.raises(ValueError):
+            Hour(12)._replace(value=25)
+
+    def test_init_var(self):
+        class Minutes(ValueObject):
+            value: int = 0
+            hours: dataclasses.InitVar[int] = 0
+
+            def __post_init__(self, hours):
+                object.__setattr__(self, "value", self.value + 60 * hours)
+
+        assert Minutes(30, hours=1).value == 90
+        assert "__init__" not in Minutes.__generated__
+
+    def test_explicit_methods(self):
+        class Temperature(ValueObject):
+            degrees: float
+
+            def __repr__(self):
+                return f"{self.degrees}°C"
+
+        assert repr(Temperature(21.5)) == "21.5°C"
+        assert "__repr__" not in Temperature.__generated__
+
+    @pytest.mark.parametrize("decorator", [lambda cls: cls, slotted])
+    def test_names_of_fields(self, decorator):
+        @decorator
+        class Point(ValueObject):
+            d: int
+            _set: int = 0
+            _FACTORY: t.List[int] = dataclasses.field(default_factory=list)
+            self: int = 0
+
+        point = Point(1, 2, [3], self=4)
+        assert (point.d, point._set, point._FACTORY, point.self) == (1, 2, [3], 4)
+        assert Point(1)._FACTORY == []
+        assert repr(point) == f"{Point.__qualname__}(d=1, _set=2, _FACTORY=[3], self=4)"
+        assert point == Point(1, 2, [3], 4)
+        assert point._replace(self=5).self == 5
+
+    def test_inherited_explicit_methods(self):
+        class Temperature(ValueObject):
+            degrees: float
+
+            def __repr__(self):
+                return "CUSTOM"
+
+            def __eq__(self, other):
+                return round(self.degrees) == round(other.degrees)
+
+        class Reading(Temperature):
+            place: str = "outside"
+
+        class Outside(Reading):
+            pass
+
+        assert repr(Reading(21.5)) == repr(Outside(21.5)) == "CUSTOM"
+        assert Reading(21.4, "inside") == Outside(21.2)
+        assert Reading.__generated__ == Outside.__generated__ == ("__init__", "_replace")
+        assert Outside(21.5)._replace(place="inside") == Reading(21.5, "inside")
+
+    def test_immutability(self):
+        time = Time(12)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            time.hour = 13
+
+    def test_hash_cached(self):
+        time = Time(12, 30)
+        with mock.patch("builtins.hash", wraps=hash) as hash_:
+            assert {time, Time(12, 30)} == {time}
+            assert time in {time}
+        # the fields are hashed only once per object
+        assert hash_.call_count == 2
+        assert hash(time) == hash(Time(12, 30))
+
+    def test_pickle(self):
+        time = Time(12, 30)
+        hash(time)
+        clone = pickle.loads(pickle.dumps(time))
+        assert clone == time
+        assert not hasattr(clone, "__cached_hash__")
+        assert copy.copy(time) == time
+
+
+class TestSlotted:
+    def test_slots(self):
+        time = SlottedTime(12)
+        assert not hasattr(time, "__dict__")
+        assert time == SlottedTime(hour=12, minute=0)
+        assert repr(time) == "SlottedTime(hour=12)"
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            time.hour = 13
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            time.second = 0
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            del time.hour
+
+    def test_replace(self):
+        time = SlottedTime(12)
+        assert time._replace(minute=30) == SlottedTime(12, 30)
+        with pytest.raises(TypeError):
+            time._replace(second=1)
+
+    def test_hash(self):
+        time = SlottedTime(12)
+        assert hash(time) == hash(SlottedTime(12)) == hash(time)
+        assert pickle.loads(pickle.dumps(time)) == time
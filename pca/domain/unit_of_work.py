@@ -0,0 +1,141 @@
+import typing as t
+
+from contextvars import ContextVar
+
+from pca.interfaces.repository import Id
+
+from .entity import Entity
+
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from .repository import Repository
+
+
+_current_unit_of_work: "ContextVar[t.Optional[UnitOfWork]]" = ContextVar(
+    "unit_of_work", default=None
+)
+
+
+def get_unit_of_work() -> t.Optional["UnitOfWork"]:
+    """Returns the unit of work opened in the current context, if any."""
+    return _current_unit_of_work.get()
+
+
+class UnitOfWork:
+    """
+    Keeps track of entities loaded and changed by repositories during a business transaction
+    and flushes all the changes at once, when the transaction is committed:
+
+    * identity map: `Repository.find` returns the same instance of an entity for the same id,
+      without hitting the DAO again
+    * new entities (`Repository.add`) are inserted in a batch per repository
+    * dirty entities (`Repository.update`) are updated once each, whatever the number of
+      the changes, and only with the fields that have changed; entities with the same
+      changes are updated with a single query
+    * removed entities (`Repository.remove`) are removed with a single query per repository
+
+    Repositories consult the unit of work opened in the current context:
+
+    >>> with UnitOfWork():
+    ...     bike = repo.find(bike_id)
+    ...     bike.frame_type = "road"
+    ...     repo.update(bike)
+
+    The changes are committed on exiting the context without an error, and discarded
+    otherwise. The current unit of work is kept in a context variable, so it's local
+    to a thread or an asyncio task.
+    """
+
+    def __init__(self):
+        self._identity_map: t.Dict[t.Tuple[t.Type[Entity], Id], Entity] = {}
+        # tracked entities are keyed by their identity, not equality, in the order of
+        # the registration
+        self._new: t.Dict["Repository", t.Dict[int, Entity]] = {}
+        self._dirty: t.Dict["Repository", t.Dict[int, Entity]] = {}
+        self._removed: t.Dict["Repository", t.Dict[int, Entity]] = {}
+        self._removed_keys: t.Set[t.Tuple[t.Type[Entity], Id]] = set()
+        self._tokens = []
+
+    def __enter__(self) -> "UnitOfWork":
+        self._tokens.append(_current_unit_of_work.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            _current_unit_of_work.reset(self._tokens.pop())
+
+    # identity map
+
+    def get(self, entity_class: t.Type[Entity], id_: Id) -> t.Optional[Entity]:
+        """Returns the entity of given class & id iff it's already known."""
+        return self._identity_map.get((entity_class, id_))
+
+    def register_clean(self, entity: Entity) -> None:
+        """Registers an entity loaded from the persistence layer in the identity map."""
+        self._identity_map[(entity.__class__, entity.__get_id__())] = entity
+
+    def is_removed(self, entity_class: t.Type[Entity], id_: Id) -> bool:
+        """Checks whether the entity of given class & id is to be removed on commit."""
+        return (entity_class, id_) in self._removed_keys
+
+    # tracking changes
+
+    def register_new(self, repository: "Repository", entity: Entity) -> None:
+        """Registers an entity to be inserted on commit."""
+        self._new.setdefault(repository, {})[id(entity)] = entity
+
+    def register_dirty(self, repository: "Repository", entity: Entity) -> None:
+        """
+        Registers an entity to be updated on commit. New entities are inserted with their
+        state at the commit anyway.
+        """
+        if id(entity) in self._new.get(repository, ()):
+            return
+        self._dirty.setdefault(repository, {})[id(entity)] = entity
+
+    def register_removed(self, repository: "Repository", entity: Entity) -> None:
+        """Registers an entity to be removed on commit. New entities are just forgotten."""
+        if self._new.get(repository, {}).pop(id(entity), None) is not None:
+            return
+        self._dirty.get(repository, {}).pop(id(entity), None)
+        self._removed.setdefault(repository, {})[id(entity)] = entity
+        key = (entity.__class__, entity.__get_id__())
+        self._removed_keys.add(key)
+        self._identity_map.pop(key, None)
+
+    # transaction
+
+    def commit(self) -> None:
+        """
+        Flushes all the tracked changes to the persistence layer, repository by repository:
+        inserts, then updates, then removals.
+
+        :raises: QueryErrors.NOT_FOUND iff any of the removed entities hasn't been found
+        """
+        for repository, entities in self._new.items():
+            new = list(entities.values())
+            ids = repository._insert_many(new)
+            for entity, id_ in zip(new, ids):
+                entity.__id__ = id_
+                self.register_clean(entity)
+        for repository, entities in self._dirty.items():
+            repository._update_many(list(entities.values()))
+        for repository, entities in self._removed.items():
+            repository._remove_many(list(entities.values()))
+        self._new.clear()
+        self._dirty.clear()
+        self._removed.clear()
+        self._removed_keys.clear()
+
+    def rollback(self) -> None:
+        """Discards all the tracked changes and the identity map."""
+        self._identity_map.clear()
+        self._new.clear()
+        self._dirty.clear()
+        self._removed.clear()
+        self._removed_keys.clear()
@@ -1,10 +1,222 @@
 import abc
 import dataclasses
+import inspect
+import typing as t
+
+from .slots import has_instance_dict
+
+
+_HASH_REF = "__cached_hash__"
+_GENERATED_REF = "__generated__"
+# a default of an argument of the generated `__init__`, meaning: use the default factory
+_FACTORY = object()
+
+
+def _cache_hash(hash_function: t.Callable[[t.Any], int]) -> t.Callable[[t.Any], int]:
+    """
+    Technical detail of computing the hash of a value object only once: the object is
+    immutable, so its hash doesn't change.
+    """
+
+    def __hash__(self) -> int:
+        try:
+            return getattr(self, _HASH_REF)
+        except AttributeError:
+            value = hash_function(self)
+            # supporting immutability of the object
+            object.__setattr__(self, _HASH_REF, value)
+            return value
+
+    return __hash__
+
+
+def _compile(name: str, source: str, namespace: t.Dict[str, t.Any]) -> t.Callable:
+    """Technical detail of compiling a function generated for a value object class."""
+    exec(source, namespace)
+    return namespace[name]
+
+
+def _compile_init(cls: type, fields: t.Sequence[dataclasses.Field]) -> t.Optional[t.Callable]:
+    """
+    Technical detail of generating `__init__` of the value object class, which sets the fields
+    directly (to `__dict__`, iff there is one) instead of doing it via `object.__setattr__`
+    for each of them. Returns None iff there are fields or init-only variables
+    the generated `__init__` doesn't support, so the one of the dataclass has to be kept.
+    """
+    if any(not f.init or getattr(f, "kw_only", False) for f in fields):
+        return None
+    # i.e. dataclasses.InitVar arguments
+    parameters = list(inspect.signature(cls.__init__).parameters)[1:]
+    if parameters != [f.name for f in fields]:
+        return None
+    # the names of the receiver & helpers are private, so they can't clash with the arguments:
+    # a private name of a field is mangled by the class body
+    namespace: t.Dict[str, t.Any] = {"__factory": _FACTORY}
+    arguments = []
+    if has_instance_dict(cls):
+        lines = ["    __dict = __self.__dict__"]
+        assignment = "    __dict[{name!r}] = {value}"
+    else:
+        # a slotted class
+        namespace["__set"] = object.__setattr__
+        lines = []
+        assignment = "    __set(__self, {name!r}, {value})"
+    for f in fields:
+        if f.default is not dataclasses.MISSING:
+            namespace[f"__default_{f.name}"] = f.default
+            arguments.append(f"{f.name}=__default_{f.name}")
+            value = f.name
+        elif f.default_factory is not dataclasses.MISSING:
+            namespace[f"__factory_{f.name}"] = f.default_factory
+            arguments.append(f"{f.name}=__factory")
+            value = f"__factory_{f.name}() if {f.name} is __factory else {f.name}"
+        else:
+            arguments.append(f.name)
+            value = f.name
+        lines.append(assignment.format(name=f.name, value=value))
+    if hasattr(cls, "__post_init__"):
+        lines.append("    __self.__post_init__()")
+    source = "def __init__(__self, {}):\n{}\n".format(
+        ", ".join(arguments), "\n".join(lines or ["    pass"])
+    )
+    return _compile("__init__", source, namespace)
+
+
+def _compile_repr(cls: type, fields: t.Sequence[dataclasses.Field]) -> t.Callable:
+    """
+    Technical detail of generating `__repr__` of the value object class, which skips
+    the fields of default values without iterating over the fields at each call.
+    """
+    namespace: t.Dict[str, t.Any] = {"_name": cls.__qualname__}
+    lines = ["def __repr__(__self):", "    parts = []"]
+    for f in fields:
+        if f.default is dataclasses.MISSING:
+            lines.append(f"    parts.append(f'{f.name}={{__self.{f.name}!r}}')")
+        else:
+            namespace[f"_default_{f.name}"] = f.default
+            lines += [
+                f"    value = __self.{f.name}",
+                f"    if value is not _default_{f.name}:",
+                f"        parts.append(f'{f.name}={{value!r}}')",
+            ]
+    lines.append("    return _name + '(' + ', '.join(parts) + ')'")
+    return _compile("__repr__", "\n".join(lines), namespace)
+
+
+def _compile_eq(cls: type, fields: t.Sequence[dataclasses.Field]) -> t.Callable:
+    """
+    Technical detail of generating `__eq__` of the value object class, which compares
+    the fields one by one, stopping at the first difference, instead of comparing tuples
+    of all of them.
+    """
+    comparison = " and ".join(f"__self.{f.name} == other.{f.name}" for f in fields if f.compare)
+    source = (
+        "def __eq__(__self, other):\n"
+        "    if other is __self:\n"
+        "        return True\n"
+        "    if other.__class__ is not __self.__class__:\n"
+        "        return NotImplemented\n"
+        f"    return {comparison or 'True'}\n"
+    )
+    return _compile("__eq__", source, {})
+
+
+def _compile_replace(cls: type, fields: t.Sequence[dataclasses.Field]) -> t.Callable:
+    """
+    Technical detail of generating `_replace` of the value object class, which copies
+    the fields directly, without calling `__init__`. Classes with `__post_init__` are
+    copied with `dataclasses.replace`, so the object is validated anyway.
+    """
+    if hasattr(cls, "__post_init__"):
+        return _compile(
+            "_replace",
+            "def _replace(__self, **changes):\n    return _dataclass_replace(__self, **changes)\n",
+            {"_dataclass_replace": dataclasses.replace},
+        )
+    namespace: t.Dict[str, t.Any] = {
+        "_new": object.__new__,
+        "_cls": cls,
+        "_fields": frozenset(f.name for f in fields),
+        "_set": object.__setattr__,
+    }
+    lines = ["def _replace(__self, **changes):", "    new = _new(_cls)"]
+    if has_instance_dict(cls):
+        lines.append("    d = new.__dict__")
+        lines += [f"    d[{f.name!r}] = __self.{f.name}" for f in fields]
+        update = "    d.update(changes)"
+    else:
+        lines += [f"    _set(new, {f.name!r}, __self.{f.name})" for f in fields]
+        update = "    for name, value in changes.items():\n        _set(new, name, value)"
+    lines += [
+        "    if changes:",
+        "        unknown = changes.keys() - _fields",
+        "        if unknown:",
+        "            raise TypeError(f'Unknown fields of {_cls.__qualname__}: {sorted(unknown)}')",
+        "    " + update.replace("\n", "\n    "),
+        "    return new",
+    ]
+    return _compile("_replace", "\n".join(lines), namespace)
+
+
+_COMPILERS = {
+    "__init__": _compile_init,
+    "__repr__": _compile_repr,
+    "__eq__": _compile_eq,
+    "_replace": _compile_replace,
+}
+
+
+def _specialize(cls: type, names: t.Iterable[str]) -> None:
+    """
+    Technical detail of generating the methods of given names for the value object class.
+    The names of the generated ones are kept on the class, so they can be generated again
+    when the class is recreated, i.e. by `slotted`.
+    """
+    fields = dataclasses.fields(cls)
+    generated = []
+    for name in names:
+        function = _COMPILERS[name](cls, fields)
+        if function is None:
+            continue
+        function.__qualname__ = f"{cls.__qualname__}.{name}"
+        setattr(cls, name, function)
+        generated.append(name)
+    setattr(cls, _GENERATED_REF, tuple(generated))
+
+
+def _is_default(cls: type, name: str) -> bool:
+    """
+    Technical detail of checking whether the method inherited by the class is the default
+    one or one generated for a base class, so it may be generated for the class too.
+    """
+    owner = next(klass for klass in cls.__mro__[1:] if name in vars(klass))
+    return owner is ValueObject or owner is object or name in vars(owner).get(_GENERATED_REF, ())
 
 
 class ValueObject(abc.ABC):
+    __slots__ = ()
+    __extra_slots__ = ("__weakref__", _HASH_REF)
+    """Names of the slots, besides the fields, of a class decorated with `slotted`."""
+
     def __init_subclass__(cls, **kwargs):
-        return dataclasses.dataclass(cls, init=True, frozen=True, repr=False)
+        if "__dataclass_fields__" in cls.__dict__:
+            # the class is recreated out of a dataclass already, i.e. by `slotted`, so
+            # the generated methods have to follow its new layout
+            _specialize(cls, cls.__dict__.get(_GENERATED_REF, ()))
+            return
+        # methods defined explicitly by the class or its bases are respected; `__init__`
+        # is generated by the dataclass for the fields of the class anyway
+        names = [
+            name
+            for name in _COMPILERS
+            if name not in cls.__dict__ and (name == "__init__" or _is_default(cls, name))
+        ]
+        eq = "__eq__" in names or "__eq__" in cls.__dict__
+        dataclasses.dataclass(cls, init=True, frozen=True, repr=False, eq=eq)
+        if cls.__dict__.get("__hash__") is not None:
+            cls.__hash__ = _cache_hash(cls.__hash__)
+        _specialize(cls, names)
+        return cls
 
     def __init__(self, *args, **kwargs):
         pass
@@ -20,3 +232,22 @@ class ValueObject(abc.ABC):
             f"{name}={repr(value)}" for name, value, default in fields if value is not default
         )
         return f"{self.__class__.__qualname__}({fields_str})"
+
+    def _replace(self, **changes: t.Any) -> "ValueObject":
+        """
+        Returns a copy of the object with given fields replaced. Specialized for each class,
+        so that the copy is made without calling `__init__`.
+        """
+        return dataclasses.replace(self, **changes)
+
+    def __getstate__(self) -> t.Dict[str, t.Any]:
+        """
+        Only the fields are pickled (or copied): the cached hash isn't, as hashes
+        (i.e. of strings) differ between processes.
+        """
+        return {f.name: getattr(self, f.name) for f in dataclasses.fields(self)}
+
+    def __setstate__(self, state: t.Dict[str, t.Any]) -> None:
+        for name, value in state.items():
+            # supporting immutability of the object
+            object.__setattr__(self, name, value)
@@ -10,3 +10,6 @@ class IntegrationErrors(ErrorCatalog):
     NO_TABLE_NAME_PROVIDED = ConfigError(
         hint="A DB's table name, for integration with a DB library, hasn't been provided."
     )
+    INVALID_INDEX_PATH = ConfigError(
+        hint="A path of an index can't be expressed as a SQLite JSON path, i.e. it contains '\"'."
+    )
@@ -0,0 +1,428 @@
+import json
+import queue
+import re
+import threading
+import typing as t
+
+from contextlib import contextmanager
+from functools import reduce
+from operator import and_
+
+from pca.data.dao import (
+    AbstractDao,
+    QueryChain,
+)
+from pca.data.errors import QueryErrors
+from pca.data.predicate import (
+    Operation,
+    Predicate,
+    Var,
+)
+from pca.interfaces.dao import (
+    BatchOfDto,
+    BatchOfKwargs,
+    Dto,
+    Id,
+    Ids,
+    Kwargs,
+)
+from pca.utils.dependency_injection import Container
+
+from .errors import IntegrationErrors
+
+
+try:
+    import sqlite3
+except ImportError:  # pragma: no cover
+    sqlite3 = None
+
+
+MEMORY_PATH = ":memory:"
+
+Sql = t.Tuple[str, t.List[t.Any]]
+
+_COMPARISONS = {
+    Operation.EQ: "=",
+    Operation.NE: "!=",
+    Operation.LT: "<",
+    Operation.LE: "<=",
+    Operation.GT: ">",
+    Operation.GE: ">=",
+}
+_SQL_VALUE_TYPES = (str, int, float, bool)
+# types of JSON values (as named by `json_type`) comparable in Python to strings & numbers;
+# i.e. `json_extract` gives JSON text for arrays & objects, which mustn't equal a string
+_JSON_TEXT_TYPES = "'text'"
+_JSON_NUMBER_TYPES = "'integer', 'real', 'true', 'false'"
+
+
+def _regexp_match(pattern: str, value: t.Any) -> bool:
+    return isinstance(value, str) and bool(re.match(pattern, value))
+
+
+def _regexp_search(pattern: str, value: t.Any) -> bool:
+    return isinstance(value, str) and bool(re.search(pattern, value))
+
+
+def quote_identifier(name: str) -> str:
+    """Quotes a name of a table or an index to be put into a SQL statement."""
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def json_path_expression(path: t.Sequence[str]) -> t.Optional[str]:
+    """
+    Translates a path of a predicate into the SQL expression extracting the value out of
+    the JSON column. Returns None iff the path can't be expressed as a SQLite JSON path.
+
+    NB: the expression is rendered as a literal (not as a parameter), so SQLite is able to use
+    expression indexes declared with the same path.
+    """
+    if any('"' in part for part in path):
+        return None
+    json_path = "$" + "".join(f'."{part}"' for part in path)
+    return "'{}'".format(json_path.replace("'", "''"))
+
+
+def predicate_to_sql(predicate: Predicate) -> t.Optional[Sql]:
+    """
+    Translates a predicate tree into a SQL condition on the `data` JSON column, with its
+    parameters. Returns None iff any part of the predicate can't be translated, ie. a path
+    or a value is not expressible in SQL or the operation has no SQL counterpart (`test`,
+    `any`, `all`).
+
+    The translation respects the semantics of evaluating the predicate in Python: a missing
+    path never satisfies a condition.
+    """
+    operator = predicate.operator
+    if operator in (Operation.AND, Operation.OR):
+        translated = [predicate_to_sql(p) for p in predicate.args]
+        if not all(translated):
+            return None
+        joint = f" {operator.value.upper()} "
+        return (
+            "({})".format(joint.join(sql for sql, _ in translated)),
+            [param for _, params in translated for param in params],
+        )
+    if operator is Operation.NOT:
+        translated = predicate_to_sql(predicate.args[0])
+        if not translated:
+            return None
+        sql, params = translated
+        # missing paths give NULLs, which have to be false before negating
+        return f"NOT COALESCE({sql}, 0)", params
+
+    path = predicate.args[0]
+    expression = json_path_expression(path)
+    if expression is None:
+        return None
+    extract = f"json_extract(data, {expression})"
+    json_type = f"json_type(data, {expression})"
+    if operator is Operation.EXISTS:
+        return f"{json_type} IS NOT NULL", []
+    if operator is Operation.MATCHES:
+        return f"pca_regexp_match(?, {extract})", [predicate.args[1]]
+    if operator is Operation.SEARCH:
+        return f"pca_regexp_search(?, {extract})", [predicate.args[1]]
+    if operator not in _COMPARISONS:
+        return None
+
+    value = predicate.args[1]
+    if value is None and operator in (Operation.EQ, Operation.NE):
+        return f"{json_type} {_COMPARISONS[operator]} 'null'", []
+    if isinstance(value, Var) or not isinstance(value, _SQL_VALUE_TYPES):
+        return None
+    types = _JSON_TEXT_TYPES if isinstance(value, str) else _JSON_NUMBER_TYPES
+    if operator is Operation.NE:
+        # `None != value` & a value of another type `!= value` are true in Python, while
+        # `NULL != value` is not in SQL
+        return (
+            f"({json_type} = 'null' OR {json_type} NOT IN ({types}) OR {extract} != ?)",
+            [value],
+        )
+    # values of other types are never equal in Python, and can't be ordered at all
+    return f"({json_type} IN ({types}) AND {extract} {_COMPARISONS[operator]} ?)", [value]
+
+
+def _split_conjunction(predicate: Predicate) -> t.Iterator[Predicate]:
+    if predicate.operator is Operation.AND:
+        for p in predicate.args:
+            yield from _split_conjunction(p)
+    else:
+        yield predicate
+
+
+class ConnectionPool:
+    """
+    A pool of SQLite connections to a single database file.
+
+    A thread that already holds a connection gets the same one when it asks for a connection
+    again, ie. when it executes a command while streaming results of a query.
+    """
+
+    def __init__(self, path: str, size: int = 5):
+        self.path = path
+        # every connection to ':memory:' opens a separate database, so there might be only one
+        self.size = 1 if path == MEMORY_PATH else size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._connections: t.List["sqlite3.Connection"] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextmanager
+    def connection(self) -> t.Iterator["sqlite3.Connection"]:
+        held = getattr(self._local, "connection", None)
+        if held is not None:
+            yield held
+            return
+        connection = self._acquire()
+        self._local.connection = connection
+        try:
+            yield connection
+        finally:
+            if getattr(self._local, "connection", None) is connection:
+                self._local.connection = None
+            self._idle.put(connection)
+
+    @contextmanager
+    def transaction(self) -> t.Iterator["sqlite3.Connection"]:
+        """Executes statements of the block atomically, holding the write lock of the DB."""
+        with self.connection() as connection:
+            if connection.in_transaction:
+                yield connection
+                return
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+
+    def _acquire(self) -> "sqlite3.Connection":
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._connections) < self.size:
+                connection = self._connect()
+                self._connections.append(connection)
+                return connection
+        return self._idle.get()
+
+    def _connect(self) -> "sqlite3.Connection":
+        # transactions are controlled explicitly, see `transaction`
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        connection.create_function("pca_regexp_match", 2, _regexp_match)
+        connection.create_function("pca_regexp_search", 2, _regexp_search)
+        return connection
+
+
+class SqliteDao(AbstractDao[int]):
+    """
+    Adapts a SQLite table to IDao interface. DTOs are stored as JSON documents in a single
+    column and queried with functions of the SQLite JSON1 extension.
+
+    * predicates are translated into SQL; the parts that have no SQL counterpart (ie.
+      `Operation.TEST`) are evaluated in Python on the rows already filtered by SQL
+    * `indexes` declares paths of the documents (dotted, as in `where`) to be indexed with
+      expression indexes
+    * connections are pooled per database file; DAOs using the same file share the pool
+    * results of iterating over a query are streamed from the cursor
+    """
+
+    _pool_cache: t.ClassVar[t.Dict[str, ConnectionPool]] = {}
+
+    @classmethod
+    def clear_pool_cache(cls):
+        for pool in cls._pool_cache.values():
+            pool.close()
+        cls._pool_cache.clear()
+
+    def __init__(
+        self,
+        container: Container,
+        path: str = MEMORY_PATH,
+        table_name: str = None,
+        qualifier: t.Any = None,
+        indexes: t.Sequence[str] = (),
+        pool_size: int = 5,
+    ):
+        if not sqlite3:  # pragma: no cover
+            raise IntegrationErrors.NOT_FOUND.with_params(target="sqlite3")
+        self._container = container
+        self._path = path
+        self._table_name = table_name or qualifier
+        if not self._table_name:
+            raise IntegrationErrors.NO_TABLE_NAME_PROVIDED
+        self._table = quote_identifier(self._table_name)
+
+        if path == MEMORY_PATH:
+            self._pool = ConnectionPool(path, pool_size)
+        else:
+            if path not in self._pool_cache:
+                self._pool_cache[path] = ConnectionPool(path, pool_size)
+            self._pool = self._pool_cache[path]
+
+        index_expressions = {}
+        for index_path in indexes:
+            expression = json_path_expression(index_path.split("."))
+            if expression is None:
+                raise IntegrationErrors.INVALID_INDEX_PATH.with_params(path=index_path)
+            index_expressions[index_path] = expression
+
+        with self._pool.connection() as connection:
+            try:
+                connection.execute("SELECT json('{}')")
+            except sqlite3.OperationalError:  # pragma: no cover
+                raise IntegrationErrors.NOT_FOUND.with_params(target="sqlite3 JSON1")
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._table} "
+                f"(id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT NOT NULL)"
+            )
+            for index_path, expression in index_expressions.items():
+                index_name = quote_identifier(f"{self._table_name}__{index_path}")
+                connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} "
+                    f"ON {self._table} (json_extract(data, {expression}))"
+                )
+
+    def _build_query(self, query_chain: QueryChain) -> t.Tuple[Sql, t.Optional[Predicate]]:
+        """
+        Technical detail of translating the query chain into a SQL condition and a predicate
+        that has to be evaluated in Python on the rows filtered by the condition.
+        """
+        conditions = []
+        params = []
+        untranslated = []
+        if query_chain._ids:
+            conditions.append("id IN (SELECT value FROM json_each(?))")
+            params.append(json.dumps(list(query_chain._ids)))
+        for predicate in query_chain._filters or ():
+            for conjunct in _split_conjunction(predicate):
+                translated = predicate_to_sql(conjunct)
+                if translated:
+                    conditions.append(translated[0])
+                    params.extend(translated[1])
+                else:
+                    untranslated.append(conjunct)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        residue = reduce(and_, untranslated) if untranslated else None
+        return (where, params), residue
+
+    def _iterate(
+        self, connection: "sqlite3.Connection", query_chain: QueryChain
+    ) -> t.Iterator[Dto]:
+        """Technical detail of streaming DTOs specified by the query."""
+        (where, params), residue = self._build_query(query_chain)
+        cursor = connection.execute(
+            f"SELECT id, data FROM {self._table}{where} ORDER BY id", params
+        )
+        for id_, data in cursor:
+            dto = Dto(json.loads(data))
+            dto.__id__ = id_
+            if residue is None or residue(dto):
+                yield dto
+
+    def _resolve_filter(self, query_chain: QueryChain) -> BatchOfDto:
+        """Resolves filtering for any other resolving operation to compute."""
+        with self._pool.connection() as connection:
+            yield from self._iterate(connection, query_chain)
+
+    def _resolve_get(self, dtos: BatchOfDto, id_: Id, nullable: bool = False) -> t.Optional[Dto]:
+        """Resolves `get` query described by the ids."""
+        result = next((dto for dto in dtos if dto.id == id_), None)
+        if result is not None:
+            return result
+        elif nullable:
+            return
+        raise QueryErrors.NOT_FOUND.with_params(id=id_)
+
+    def _resolve_exists(self, query_chain: QueryChain) -> bool:
+        """Returns whether any object specified by the query exist."""
+        (where, params), residue = self._build_query(query_chain)
+        if residue is not None:
+            return any(True for _ in self._resolve_filter(query_chain))
+        with self._pool.connection() as connection:
+            sql = f"SELECT EXISTS (SELECT 1 FROM {self._table}{where})"
+            return bool(connection.execute(sql, params).fetchone()[0])
+
+    def _resolve_count(self, query_chain: QueryChain) -> int:
+        """
+        Counts objects filtering them out by the query specifying conditions that they should met.
+        """
+        (where, params), residue = self._build_query(query_chain)
+        if residue is not None:
+            return sum(1 for _ in self._resolve_filter(query_chain))
+        with self._pool.connection() as connection:
+            sql = f"SELECT COUNT(*) FROM {self._table}{where}"
+            return connection.execute(sql, params).fetchone()[0]
+
+    def _resolve_update(self, query_chain: QueryChain, update: Kwargs) -> Ids:
+        """
+        Updates all objects specified by the query with given update.
+        """
+        with self._pool.transaction() as connection:
+            dtos = list(self._iterate(connection, query_chain))
+            for dto in dtos:
+                dto.update(update)
+            connection.executemany(
+                f"UPDATE {self._table} SET data = ? WHERE id = ?",
+                [(json.dumps(dto), dto.id) for dto in dtos],
+            )
+        return [dto.id for dto in dtos]
+
+    def _resolve_remove(self, query_chain: QueryChain) -> Ids:
+        """
+        Removes all objects specified by the query from the collection.
+
+        :raises: QueryError iff query is trivial. If you want to empty your collection,
+        use `clear` instead.
+        """
+        if query_chain._is_trivial:
+            raise QueryErrors.UNRESTRICTED_REMOVE
+        with self._pool.transaction() as connection:
+            ids = [dto.id for dto in self._iterate(connection, query_chain)]
+            connection.executemany(
+                f"DELETE FROM {self._table} WHERE id = ?", [(id_,) for id_ in ids]
+            )
+        return ids
+
+    # dao commands
+
+    def insert(self, **kwargs) -> Id:
+        """
+        Inserts the object into the collection.
+
+        :returns: id of the inserted object
+        """
+        with self._pool.connection() as connection:
+            sql = f"INSERT INTO {self._table} (data) VALUES (?)"
+            return connection.execute(sql, (json.dumps(kwargs),)).lastrowid
+
+    def batch_insert(self, batch_kwargs: BatchOfKwargs) -> Ids:
+        """
+        Inserts multiple objects into the collection.
+
+        :returns: a iterable of ids
+        """
+        rows = [(json.dumps(kwargs),) for kwargs in batch_kwargs]
+        with self._pool.transaction() as connection:
+            # the write lock is held, so AUTOINCREMENT ids of the batch are consecutive
+            (last_id,) = connection.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name = ?",
+                (self._table_name,),
+            ).fetchone()
+            connection.executemany(f"INSERT INTO {self._table} (data) VALUES (?)", rows)
+        return tuple(range(last_id + 1, last_id + 1 + len(rows)))
+
+    def clear(self) -> None:
+        """Clears the collection."""
+        with self._pool.connection() as connection:
+            connection.execute(f"DELETE FROM {self._table}")
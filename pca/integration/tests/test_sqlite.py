@@ -0,0 +1,269 @@
+import threading
+
+import pytest
+
+from pca.data.errors import (
+    QueryError,
+    QueryErrors,
+)
+from pca.data.predicate import where
+from pca.integration.errors import (
+    ConfigError,
+    IntegrationErrors,
+)
+from pca.integration.sqlite import (
+    ConnectionPool,
+    SqliteDao,
+    predicate_to_sql,
+)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def sqlite3():
+    return pytest.importorskip("sqlite3")
+
+
+class TestConstruction:
+    @pytest.fixture
+    def path(self, tmpdir):
+        return str(tmpdir.join("db.sqlite"))
+
+    @pytest.fixture
+    def file_dao(self, mock_container, path):
+        dao = SqliteDao(mock_container, path=path, table_name="table_name", indexes=["char"])
+        yield dao
+        dao.clear_pool_cache()
+
+    def test_pool_cache(self, mock_container, path, file_dao: SqliteDao):
+        assert SqliteDao._pool_cache.get(path) is file_dao._pool
+        second_dao = SqliteDao(mock_container, path=path, table_name="another_table")
+        assert second_dao._pool is file_dao._pool
+
+    def test_persistence(self, mock_container, path, file_dao: SqliteDao):
+        file_dao.insert(char="a")
+        file_dao.clear_pool_cache()
+        dao = SqliteDao(mock_container, path=path, table_name="table_name")
+        assert list(dao.all()) == [{"char": "a"}]
+
+    def test_expression_index(self, path, file_dao: SqliteDao):
+        (where_sql, params), _ = file_dao._build_query(file_dao.filter(where("char") == "a"))
+        with file_dao._pool.connection() as connection:
+            plan = connection.execute(
+                f"EXPLAIN QUERY PLAN SELECT id FROM {file_dao._table}{where_sql}", params
+            ).fetchall()
+        assert "USING INDEX table_name__char" in str(plan)
+
+    def test_invalid_index_path(self, mock_container):
+        with pytest.raises(ConfigError) as error_info:
+            SqliteDao(mock_container, table_name="table_name", indexes=['a"b'])
+        assert error_info.value == IntegrationErrors.INVALID_INDEX_PATH
+        assert error_info.value.params == {"path": 'a"b'}
+
+    def test_no_table_name(self, mock_container):
+        with pytest.raises(ConfigError) as error_info:
+            SqliteDao(mock_container)
+        assert error_info.value == IntegrationErrors.NO_TABLE_NAME_PROVIDED
+
+
+class TestConnectionPool:
+    def test_reentrant_connection(self, tmpdir):
+        pool = ConnectionPool(str(tmpdir.join("db.sqlite")), size=2)
+        with pool.connection() as outer:
+            with pool.connection() as inner:
+                assert inner is outer
+        pool.close()
+
+    def test_size(self, tmpdir):
+        pool = ConnectionPool(str(tmpdir.join("db.sqlite")), size=2)
+        acquired = []
+
+        def acquire():
+            with pool.connection() as connection:
+                acquired.append(connection)
+
+        with pool.connection() as connection:
+            thread = threading.Thread(target=acquire)
+            thread.start()
+            thread.join()
+        assert acquired[0] is not connection
+        assert len(pool._connections) == 2
+        pool.close()
+
+
+pred_a = where("char") == "a"
+pred_not_a = ~(where("char") == "a")
+pred_c = where("char") == "c"
+pred_z = where("char") == "z"
+
+
+class TestPredicateTranslation:
+    def test_comparison(self):
+        assert predicate_to_sql(where("foo.bar") >= 3) == (
+            "(json_type(data, '$.\"foo\".\"bar\"') IN ('integer', 'real', 'true', 'false') "
+            'AND json_extract(data, \'$."foo"."bar"\') >= ?)',
+            [3],
+        )
+
+    def test_none(self):
+        assert predicate_to_sql(where("foo") == None) == (  # noqa: E711
+            "json_type(data, '$.\"foo\"') = 'null'",
+            [],
+        )
+
+    def test_test_operation(self):
+        assert predicate_to_sql(where("foo").test(lambda value: True)) is None
+        assert predicate_to_sql(where("foo").test(lambda value: True) | pred_a) is None
+
+    def test_not_composite(self):
+        sql, params = predicate_to_sql(~(pred_a | where("foo").exists()))
+        assert sql.startswith("NOT COALESCE((")
+        assert params == ["a"]
+
+
+class TestApi:
+    @pytest.fixture
+    def dao(self, mock_container):
+        """
+        In-memory table that has three documents pre-assigned:
+            {'char': 'a', 'is_a': True},
+            {'char': 'b', 'is_a': False},
+            {'char': 'c', 'is_a': False}
+        """
+        dao = SqliteDao(mock_container, table_name="table_name")
+        dao.batch_insert([{"char": c, "is_a": c == "a"} for c in "abc"])
+        return dao
+
+    # Dao.all
+    def test_all(self, dao: SqliteDao):
+        assert list(dao.all()) == [
+            {"char": "a", "is_a": True},
+            {"char": "b", "is_a": False},
+            {"char": "c", "is_a": False},
+        ]
+
+    # QueryChain.filter
+    def test_multiple_filter_success(self, dao: SqliteDao):
+        assert list(dao.filter(pred_not_a).filter(pred_c)) == [{"char": "c", "is_a": False}]
+
+    def test_filter_missing_path(self, dao: SqliteDao):
+        dao.insert(foo="bar")
+        assert [dto.id for dto in dao.filter(pred_not_a)] == [2, 3, 4]
+        assert [dto.id for dto in dao.filter(where("char") != "a")] == [2, 3]
+
+    def test_filter_json_types(self, dao: SqliteDao):
+        dao.batch_insert([{"char": [1, 2]}, {"char": "[1,2]"}, {"char": {"a": 1}}, {"char": 1}])
+        assert [dto.id for dto in dao.filter(where("char") == "[1,2]")] == [5]
+        assert [dto.id for dto in dao.filter(where("char") == '{"a":1}')] == []
+        assert [dto.id for dto in dao.filter(where("char") > "b")] == [3]
+        assert [dto.id for dto in dao.filter(where("char") == 1)] == [7]
+        assert [dto.id for dto in dao.filter(where("char") != "a")] == [2, 3, 4, 5, 6, 7]
+
+    def test_filter_python_fallback(self, dao: SqliteDao):
+        pred_b_or_c = where("char").test(lambda value: value in "bc")
+        assert list(dao.filter(pred_b_or_c & (where("is_a") == False))) == [  # noqa: E712
+            {"char": "b", "is_a": False},
+            {"char": "c", "is_a": False},
+        ]
+        assert dao.filter(pred_b_or_c).count() == 2
+        assert dao.filter(pred_b_or_c & pred_c).exists()
+
+    def test_filter_regex(self, dao: SqliteDao):
+        assert list(dao.filter(where("char").matches(r"[ab]"))) == [
+            {"char": "a", "is_a": True},
+            {"char": "b", "is_a": False},
+        ]
+        assert list(dao.filter(where("char").search(r"c$"))) == [{"char": "c", "is_a": False}]
+
+    # QueryChain.filter_by
+    def test_filter_by_success(self, dao: SqliteDao):
+        assert list(dao.filter(pred_not_a).filter_by(id_=3)) == [{"char": "c", "is_a": False}]
+
+    def test_filter_by_ids(self, dao: SqliteDao):
+        assert [dto.id for dto in dao.filter_by(ids=[3, 1, 42])] == [1, 3]
+
+    def test_filter_by_two_times_error(self, dao: SqliteDao):
+        with pytest.raises(QueryError) as error_info:
+            assert dao.all().filter_by(id_=3).filter_by(id_=5)
+        assert error_info.value == QueryErrors.CONFLICTING_QUERY_ARGUMENTS
+
+    # QueryChain.get
+    def test_get_success(self, dao: SqliteDao):
+        dto = dao.get(1)
+        assert dto == {"char": "a", "is_a": True}
+        assert dto.id == 1
+
+    def test_get_fail(self, dao: SqliteDao):
+        assert dao.get(42) is None
+
+    def test_filtered_get_fail(self, dao: SqliteDao):
+        assert dao.filter(pred_not_a).get(1) is None
+
+    # QueryChain.exists
+    def test_exists_all_success(self, dao: SqliteDao):
+        assert dao.all().exists()
+
+    def test_exists_empty_fail(self, dao: SqliteDao):
+        dao.clear()
+        assert not dao.all().exists()
+
+    def test_exists_filtered_fail(self, dao: SqliteDao):
+        assert not dao.filter(pred_z).exists()
+
+    # QueryChain.count
+    def test_count_all(self, dao: SqliteDao):
+        assert dao.all().count() == 3
+
+    def test_filtered_count(self, dao: SqliteDao):
+        assert dao.filter(pred_not_a).count() == 2
+
+    # QueryChain.update
+    def test_update_filtered(self, dao: SqliteDao):
+        ids = dao.filter(pred_not_a).update(char="z")
+        assert ids == [2, 3]
+        assert list(dao.all()) == [
+            {"char": "a", "is_a": True},
+            {"char": "z", "is_a": False},
+            {"char": "z", "is_a": False},
+        ]
+
+    def test_update_while_streaming(self, dao: SqliteDao):
+        for dto in dao.all():
+            dao.filter_by(id_=dto.id).update(char=dto["char"].upper())
+        assert [dto["char"] for dto in dao.all()] == ["A", "B", "C"]
+
+    # QueryChain.remove
+    def test_remove_all_error(self, dao: SqliteDao):
+        with pytest.raises(QueryError) as error_info:
+            dao.all().remove()
+        assert error_info.value == QueryErrors.UNRESTRICTED_REMOVE
+
+    def test_remove_filtered(self, dao: SqliteDao):
+        ids = dao.filter(pred_a).remove()
+        assert ids == [1]
+        assert list(dao.all()) == [
+            {"char": "b", "is_a": False},
+            {"char": "c", "is_a": False},
+        ]
+
+    def test_remove_none(self, dao: SqliteDao):
+        assert dao.filter(pred_z).remove() == []
+        assert dao.all().count() == 3
+
+    # Dao.insert
+    def test_insert(self, dao: SqliteDao):
+        id_ = dao.insert(foo="bar")
+        assert id_ == 4
+
+    # Dao.batch_insert
+    def test_batch_insert(self, dao: SqliteDao):
+        batch = [{"foo": "bar"}, {"foo": "baz"}]
+        dao.filter_by(id_=3).remove()
+        result = dao.batch_insert(batch)
+        assert result == (4, 5)
+        assert list(dao.filter(where("foo").exists())) == batch
+        assert [dto.id for dto in dao.filter(where("foo").exists())] == [4, 5]
+
+    # Dao.clear
+    def test_clear(self, dao: SqliteDao):
+        dao.clear()
+        assert list(dao.all()) == []
@@ -178,3 +178,134 @@ class IDao(t.Generic[Id]):
         Removes all items from the collection.
         """
         raise NotImplementedError
+
+
+class IAsyncQueryChain(t.AsyncIterable[Dto], t.Generic[Id]):
+    """
+    Asynchronous counterpart of `IQueryChain`: lazy queries are built synchronously, while
+    evaluating queries & commands are coroutines and the results are iterated over with
+    `async for`.
+    """
+
+    # lazy queries
+
+    def filter(self, predicate: IPredicate) -> "IAsyncQueryChain":
+        """
+        Filters out objects by the predicate specifying conditions that they
+        should met. Can be chained via `IAsyncQueryChain` helper class.
+        """
+        raise NotImplementedError
+
+    def filter_by(self, id_: Id = None, ids: Ids = None) -> "IAsyncQueryChain":
+        """
+        Filters objects by a single id or a iterable of ids.
+
+        :raises: InvalidQueryError if:
+            * both `id_` and `ids` arguments are defined
+            * or the query is already filtered by id
+        """
+        raise NotImplementedError
+
+    # evaluating queries
+
+    def __aiter__(self) -> t.AsyncIterator[Dto]:
+        """Yields values"""
+        raise NotImplementedError
+
+    async def get(self, id_: Id) -> t.Optional[Dto]:
+        """Returns object of given id, or None iff not present."""
+        raise NotImplementedError
+
+    async def exists(self) -> bool:
+        """Returns whether any object specified by the query exist."""
+        raise NotImplementedError
+
+    async def count(self) -> int:
+        """
+        Counts objects filtering them out by the query specifying conditions that they
+        should met.
+        """
+        raise NotImplementedError
+
+    # evaluating commands
+
+    async def update(self, **update) -> Ids:
+        """
+        Updates all objects specified by the query with given update.
+        """
+        raise NotImplementedError
+
+    async def remove(self) -> Ids:
+        """
+        Removes all objects specified by the query from the collection.
+        """
+        raise NotImplementedError
+
+
+class IAsyncDao(t.Generic[Id]):
+    """
+    Asynchronous counterpart of `IDao`: lazy queries return `IAsyncQueryChain`, while
+    evaluating queries and instant commands are coroutines.
+    """
+
+    # lazy queries
+
+    def all(self) -> IAsyncQueryChain:
+        """
+        Returns a query chain representing all objects.
+
+        Useful to explicitly denote counting, updating or removing all objects.
+        """
+        raise NotImplementedError
+
+    def filter(self, predicate: IPredicate) -> IAsyncQueryChain:
+        """
+        Filters out objects by the predicate specifying conditions that they
+        should met.
+        Can be chained with other queries via `IAsyncQueryChain` helper.
+        """
+        raise NotImplementedError
+
+    def filter_by(self, id_: Id = None, ids: Ids = None) -> IAsyncQueryChain:
+        """
+        Filters objects by a single id or a iterable of ids.
+        Can be chained with other queries via `IAsyncQueryChain` helper.
+
+        :raises: InvalidQueryError if:
+            * both `id_` and `ids` arguments are defined
+            * or the query is already filtered by id
+        """
+        raise NotImplementedError
+
+    # evaluating queries
+
+    async def get(self, id_: Id) -> t.Optional[Dto]:
+        """
+        Returns object of given id, or None iff not present.
+        Shortcut for querying via `IAsyncDao.all`.
+        """
+        raise NotImplementedError
+
+    # instant commands
+
+    async def insert(self, **kwargs) -> Id:
+        """
+        Inserts the object into the collection.
+
+        :returns: id of the inserted object
+        """
+        raise NotImplementedError
+
+    async def batch_insert(self, batch_kwargs: BatchOfKwargs) -> Ids:
+        """
+        Inserts multiple objects into the collection.
+
+        :returns: a iterable of ids
+        """
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        """
+        Removes all items from the collection.
+        """
+        raise NotImplementedError
@@ -57,3 +57,19 @@ class IRepository(t.Generic[Id, Entity]):
     def remove(self, entity: Entity) -> None:
         """Removes the object from the underlying persistence layer via DAO."""
         raise NotImplementedError
+
+    def find_many(self, ids: t.Iterable[Id]) -> t.List[Entity]:
+        """Returns objects of given ids, in the order of the ids."""
+        raise NotImplementedError
+
+    def add_many(self, entities: t.Iterable[Entity]):
+        """Adds the objects to the repo to the underlying persistence layer via its DAO."""
+        raise NotImplementedError
+
+    def update_many(self, entities: t.Iterable[Entity]) -> None:
+        """Updates the objects in the repo."""
+        raise NotImplementedError
+
+    def remove_many(self, entities: t.Iterable[Entity]) -> None:
+        """Removes the objects from the underlying persistence layer via DAO."""
+        raise NotImplementedError
@@ -3,6 +3,7 @@ from .component import (  # noqa: F401
     Injectable,
     create_component,
     get_attribute_dependencies,
+    get_constructor_dependencies,
     get_dependencies_contexts,
     set_dependencies_contexts,
 )
@@ -21,5 +22,9 @@ from .decorators import (  # noqa: F401
     inject,
     scope,
 )
-from .descriptors import Inject  # noqa: F401
+from .descriptors import (  # noqa: F401
+    Inject,
+    LazyProxy,
+)
 from .errors import DIErrors  # noqa: F401
+from .stats import ResolutionStats  # noqa: F401
@@ -66,6 +66,27 @@ def get_attribute_dependencies(instance: t.Any) -> t.Dict[str, t.Any]:
     }
 
 
+def get_constructor_dependencies(constructor: t.Any) -> t.List[DIContext]:
+    """
+    A helper function to gather DI contexts of all the dependencies of a constructor: of its
+    attributes and of its methods, including the ones inherited by a class.
+    """
+    if isinstance(constructor, type):
+        descriptions = [vars(klass).get(_DEPENDENCIES_REF) for klass in constructor.__mro__]
+    else:
+        descriptions = [get_dependencies_contexts(constructor)]
+    contexts = []
+    for description in descriptions:
+        if not description:
+            continue
+        contexts.extend(description.attribute_contexts.values())
+        for method in description.method_contexts.values():
+            method_description = get_dependencies_contexts(method)
+            if method_description:
+                contexts.extend(method_description.attribute_contexts.values())
+    return contexts
+
+
 class ComponentMeta(GenericABCMeta):
     """
     A metaclass that gathers all dependency markers (from its attributes and methods)
@@ -1,16 +1,28 @@
+import threading
+import time
 import typing as t
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from enum import Enum
 from functools import partial
+from types import MappingProxyType
 
-from .errors import DIErrors
+from .errors import (
+    ConfigError,
+    DIErrors,
+)
+from .stats import ResolutionStats
 
 
 NameOrInterface = t.Union[type, str]
 Constructor = t.Union[t.Type, t.Callable]
 Kwargs = t.Dict[str, t.Any]  # keyword-arguments of a Constructor
 ScopeFunction = t.Callable[[Constructor, Kwargs], t.Any]
+Resolver = t.Callable[[], t.Any]  # a compiled way to get an instance of a dependency
+ResolverKey = t.Tuple[NameOrInterface, t.Any]  # (name or interface, qualifier)
 
 _CONTAINER_REF = "__di_container__"
 _CONTEXT_REF = "__di_context__"
@@ -74,6 +86,22 @@ class DIContext:
         given container. Prioritizes name vs. interface precedence & collision when seeking for
         a dependency.
         """
+        frozen_resolvers = getattr(container, "_frozen_resolvers", None)
+        if frozen_resolvers is not None:
+            # a frozen container knows all the valid contexts, nothing to check
+            resolver = frozen_resolvers.get(self)
+            if resolver is not None:
+                return resolver()
+        self.validate()
+        if self.name:
+            return container.find_by_name(self.name, self.qualifier)
+        return container.find_by_interface(self.interface, self.qualifier)
+
+    def validate(self) -> None:
+        """
+        Checks whether the context can be resolved: it is determined and it has exactly one
+        of the identifiers defined.
+        """
         if self.name and self.interface:
             # exactly only one of those two defined
             raise DIErrors.AMBIGUOUS_DEFINITION.with_params(
@@ -83,11 +111,7 @@ class DIContext:
             raise DIErrors.INDETERMINATE_CONTEXT_BEING_RESOLVED.with_params(
                 name=self.name, interface=self.interface, get_qualifier=self.get_qualifier
             )
-        if self.name:
-            return container.find_by_name(self.name, self.qualifier)
-        elif self.interface:
-            return container.find_by_interface(self.interface, self.qualifier)
-        else:
+        if not (self.name or self.interface):
             raise DIErrors.NO_IDENTIFIER_SPECIFIED
 
 
@@ -112,8 +136,22 @@ class Container:
 
     def __init__(self, default_scope: "Scopes" = None):
         self._constructor_registry: t.Dict[DIContext, DIResolution] = {}
+        self._resolvers: t.Dict[ResolverKey, Resolver] = {}
+        # registered contexts of subclasses of a requested interface
+        self._candidates: t.Dict[ResolverKey, t.List[DIContext]] = {}
+        # incremented on each registration, so any cached resolution can be validated
+        self._version = 0
         self._singleton_registry = {}
+        self._singleton_locks: t.Dict[Constructor, threading.RLock] = {}
+        self._singleton_locks_guard = threading.Lock()
+        self._thread_registry = threading.local()
+        self._request_registry: ContextVar[t.Optional[dict]] = ContextVar(
+            f"request_registry_{id(self)}", default=None
+        )
         self._default_scope = default_scope
+        # a precomputed lookup table of a frozen container, see `Container.freeze`
+        self._frozen_resolvers: t.Optional[t.Mapping[DIContext, Resolver]] = None
+        self._stats: t.Optional[ResolutionStats] = None
 
     def register_by_name(
         self,
@@ -166,7 +204,6 @@ class Container:
 
         """
         context = DIContext(interface=interface, qualifier=qualifier)
-        # TODO Refs #20: should I register superclasses of the interface as well?
         self._register(context=context, constructor=constructor, kwargs=kwargs, scope=scope)
 
     def _register(
@@ -177,37 +214,353 @@ class Container:
         scope: "Scopes" = None,
     ):
         """Technical detail of registering a constructor"""
+        if self._frozen_resolvers is not None:
+            raise DIErrors.CONTAINER_FROZEN.with_params(context=context)
         if context in self._constructor_registry:
             raise DIErrors.ALREADY_REGISTERED.with_params(context=context)
         self._constructor_registry[context] = DIResolution(constructor=constructor, kwargs=kwargs)
         if scope is not None:
             setattr(constructor, _SCOPE_TYPE_REF, scope)
+        # a registration may change the scope of any constructor, so all the plans are stale
+        self._candidates.clear()
+        self._invalidate_resolvers()
+
+    def _invalidate_resolvers(self) -> None:
+        """Technical detail of dropping all the compiled resolvers."""
+        self._resolvers.clear()
+        self._version += 1
 
     def find_by_name(self, name: str, qualifier: t.Any = None) -> t.Any:
         """Finding registered constructor by name."""
-        return self._find(DIContext(name=name, qualifier=qualifier))
+        try:
+            resolver = self._resolvers[(name, qualifier)]
+        except KeyError:
+            resolver = self._compile((name, qualifier), DIContext(name=name, qualifier=qualifier))
+        return resolver()
 
     def find_by_interface(self, interface: type, qualifier: t.Any = None) -> t.Any:
-        """Finding registered constructor by interface."""
-        # TODO Refs #20: should I look for the subclasses of the interface as well?
-        return self._find(DIContext(interface=interface, qualifier=qualifier))
+        """
+        Finding registered constructor by interface. If there's no registration of exactly
+        the interface, a registration of its subclass (with the same qualifier) is looked for.
+
+        :raises: ConfigError iff there are many registrations of its subclasses
+            (AMBIGUOUS_INTERFACE)
+        """
+        try:
+            resolver = self._resolvers[(interface, qualifier)]
+        except KeyError:
+            context = DIContext(interface=interface, qualifier=qualifier)
+            resolver = self._compile((interface, qualifier), context)
+        return resolver()
 
     def _find(self, context: DIContext) -> t.Any:
+        return self._get_resolver(context)()
+
+    def _get_resolver(self, context: DIContext) -> Resolver:
+        """Technical detail of getting the resolution plan for a validated context."""
+        key = (context.name or context.interface, context.qualifier)
         try:
-            resolution = self._constructor_registry[context]
+            return self._resolvers[key]
         except KeyError:
-            raise DIErrors.DEFINITION_NOT_FOUND.with_params(context=context)
-        return self._get_object(resolution, context)
+            return self._compile(key, context)
 
-    def _get_object(self, resolution: DIResolution, context: DIContext = None) -> t.Any:
+    def _is_contextual(self, context: DIContext) -> bool:
         """
-        Gets proper scope type and creates instance of registered constructor accordingly.
+        Technical detail of checking whether the dependency of a validated context lives
+        in a scope opened by `scope_context` (THREAD or REQUEST), so it mustn't outlive it.
+        """
+        scope_type = getattr(self._get_resolver(context), "scope_type", None)
+        return scope_type is Scopes.THREAD or scope_type is Scopes.REQUEST
+
+    @staticmethod
+    def _is_singleton(resolver: Resolver) -> bool:
+        """
+        Technical detail of checking whether the resolver always returns the same instance.
+        The scope type is kept on the resolver by `_plan`, as an instrumented resolver wraps
+        the scope function.
+        """
+        return getattr(resolver, "scope_type", None) is Scopes.SINGLETON
+
+    def _compile(self, key: ResolverKey, context: DIContext) -> Resolver:
+        """
+        Technical detail of building the resolution plan for the context: a resolver callable
+        with the scope function and all its arguments bound. Resolvers are cached until
+        the next registration, so the hot path of finding a dependency is a single dict lookup
+        and a call.
+        """
+        try:
+            resolution = self._constructor_registry[context]
+        except KeyError:
+            candidates = self._get_candidates(context.interface, context.qualifier)
+            if not candidates:
+                raise DIErrors.DEFINITION_NOT_FOUND.with_params(context=context)
+            if len(candidates) > 1:
+                raise DIErrors.AMBIGUOUS_INTERFACE.with_params(
+                    context=context, candidates=candidates
+                )
+            resolution = self._constructor_registry[candidates[0]]
+        if self._stats is not None:
+            self._stats.record_compilation()
+        resolver = self._resolvers[key] = self._plan(resolution, context)
+        return resolver
+
+    def _get_candidates(self, interface: t.Any, qualifier: t.Any) -> t.List[DIContext]:
+        """
+        Technical detail of finding registered contexts of subclasses of the interface
+        (including virtual subclasses of ABCs). The candidates are cached until
+        the next registration.
+        """
+        if not isinstance(interface, type):
+            return []
+        try:
+            return self._candidates[(interface, qualifier)]
+        except KeyError:
+            pass
+        candidates = self._candidates[(interface, qualifier)] = [
+            context
+            for context in self._constructor_registry
+            if isinstance(context.interface, type)
+            and context.qualifier == qualifier
+            and issubclass(context.interface, interface)
+        ]
+        return candidates
+
+    def _plan(self, resolution: DIResolution, context: DIContext = None) -> Resolver:
+        """
+        Gets proper scope type and binds it with the arguments to create instance of registered
+        constructor accordingly.
         """
         kwargs = resolution.kwargs or {}
         constructor = resolution.constructor
         context = context or DIContext()
-        scope_function = get_scope_type(constructor) or self._default_scope
-        return scope_function(self, constructor, kwargs, context)
+        scope_type = scope_function = get_scope_type(constructor) or self._default_scope
+        if isinstance(scope_function, Scopes):
+            # nested partials are flattened, so the resolver calls the scope method directly
+            scope_function = scope_function.value
+        resolver = partial(scope_function, self, constructor, kwargs, context)
+        if self._stats is not None:
+            resolver = partial(self._resolve_instrumented, resolver, constructor, scope_type)
+        resolver.scope_type = scope_type
+        return resolver
+
+    def _resolve_instrumented(
+        self, resolver: Resolver, constructor: Constructor, scope_type: "Scopes"
+    ) -> t.Any:
+        """Technical detail of a resolver that records statistics of the resolution."""
+        context = resolver.args[3]
+        if scope_type is Scopes.SINGLETON:
+            hit = constructor in self._singleton_registry
+        elif scope_type is Scopes.THREAD:
+            hit = constructor in (getattr(self._thread_registry, "instances", None) or ())
+        elif scope_type is Scopes.REQUEST:
+            hit = constructor in (self._request_registry.get() or ())
+        else:
+            hit = False
+        start = time.perf_counter()
+        instance = resolver()
+        elapsed = time.perf_counter() - start
+        self._stats.record_resolution(context, constructor, scope_type, hit, elapsed)
+        return instance
+
+    @property
+    def stats(self) -> t.Optional[ResolutionStats]:
+        """Statistics of the resolutions iff enabled with `Container.enable_stats`."""
+        return self._stats
+
+    def enable_stats(self) -> ResolutionStats:
+        """
+        Starts collecting statistics of the resolutions. All the resolvers are recompiled
+        with the instrumentation.
+        """
+        if self._stats is None:
+            self._stats = ResolutionStats()
+            self._recompile()
+        return self._stats
+
+    def disable_stats(self) -> None:
+        """Stops collecting statistics; resolvers are recompiled without the instrumentation."""
+        if self._stats is not None:
+            self._stats = None
+            self._recompile()
+
+    def _recompile(self) -> None:
+        """Technical detail of replacing all the compiled resolvers, frozen ones included."""
+        self._invalidate_resolvers()
+        if self.is_frozen:
+            self._frozen_resolvers = self._build_frozen_resolvers()[0]
+
+    def _get_object(self, resolution: DIResolution, context: DIContext = None) -> t.Any:
+        """
+        Gets proper scope type and creates instance of registered constructor accordingly.
+        """
+        return self._plan(resolution, context)()
+
+    @property
+    def is_frozen(self) -> bool:
+        return self._frozen_resolvers is not None
+
+    def freeze(self, measure: bool = False) -> t.Dict[DIContext, float]:
+        """
+        Locks the registrations and precomputes an immutable lookup table of resolvers for all
+        the registered contexts. Any later registration raises `DIErrors.CONTAINER_FROZEN`.
+
+        A registration by an interface is resolvable by its base interfaces as well (except
+        `object` and `Generic`), unless another registration with the same qualifier claims
+        the same base, which would be ambiguous.
+
+        :param measure: (optional) iff True, each resolver is called once and timed. NB: it
+            constructs dependencies (and all the singletons) eagerly. REQUEST-scoped
+            dependencies are skipped, as they need an opened scope.
+        :returns: seconds that took resolving each context iff `measure` is set, otherwise
+            seconds that took compiling its resolver
+        """
+        if self.is_frozen:
+            return {}
+        self._frozen_resolvers, timings = self._build_frozen_resolvers()
+        if measure:
+            for context, resolver in self._frozen_resolvers.items():
+                start = time.perf_counter()
+                try:
+                    resolver()
+                except ConfigError as e:
+                    if e != DIErrors.SCOPE_NOT_OPENED:
+                        raise
+                    continue
+                timings[context] = time.perf_counter() - start
+        return timings
+
+    def _build_frozen_resolvers(
+        self,
+    ) -> t.Tuple[t.Mapping[DIContext, Resolver], t.Dict[DIContext, float]]:
+        """
+        Technical detail of compiling the lookup table of a frozen container, along with
+        the seconds each compilation took.
+        """
+        timings: t.Dict[DIContext, float] = {}
+        resolvers: t.Dict[DIContext, Resolver] = {}
+        for context in self._constructor_registry:
+            start = time.perf_counter()
+            resolvers[context] = self._get_resolver(context)
+            timings[context] = time.perf_counter() - start
+        for context, registered in self._get_base_interface_contexts().items():
+            self._resolvers[(context.interface, context.qualifier)] = resolvers[registered]
+            resolvers[context] = resolvers[registered]
+            timings[context] = timings[registered]
+        return MappingProxyType(resolvers), timings
+
+    def _get_base_interface_contexts(self) -> t.Dict[DIContext, DIContext]:
+        """
+        Technical detail of mapping contexts of base interfaces to the registered contexts
+        of their subclasses. Bases claimed by many registrations are left out.
+        """
+        candidates: t.Dict[DIContext, t.List[DIContext]] = {}
+        for context in self._constructor_registry:
+            if not isinstance(context.interface, type):
+                continue
+            for base in context.interface.__mro__[1:]:
+                if base in (object, t.Generic):
+                    continue
+                base_context = DIContext(interface=base, qualifier=context.qualifier)
+                if base_context not in self._constructor_registry:
+                    candidates.setdefault(base_context, []).append(context)
+        return {
+            base_context: registered[0]
+            for base_context, registered in candidates.items()
+            if len(registered) == 1
+        }
+
+    def warm_up(self, parallel: bool = False, max_workers: int = None) -> None:
+        """
+        Validates the dependency graph of all the registrations and constructs all
+        the singletons eagerly, so misconfigurations don't surface under traffic and first
+        requests aren't slowed down by constructing them.
+
+        The graph is built out of DI dependencies declared by constructors: `Inject`
+        attributes of components and `inject`-decorated methods. Dependencies
+        with indeterminate contexts are skipped, as they are known only for a specific
+        instance. Singletons are constructed in the order of their dependencies.
+
+        :param parallel: construct independent singletons concurrently in a thread pool
+        :param max_workers: (optional) size of the thread pool
+        :raises: ConfigError iff:
+            * a dependency isn't registered (DEFINITION_NOT_FOUND)
+            * the dependencies form a cycle (CIRCULAR_DEPENDENCY)
+        """
+        graph = self._get_dependency_graph()
+        levels = self._sort_topologically(graph)
+        for level in levels:
+            singletons = [
+                resolver
+                for resolver in (self._get_resolver(context) for context in level)
+                if self._is_singleton(resolver)
+            ]
+            if parallel and len(singletons) > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    # `list` consumes the results, so any construction error is raised here
+                    list(executor.map(lambda resolver: resolver(), singletons))
+            else:
+                for resolver in singletons:
+                    resolver()
+
+    def _get_dependency_graph(self) -> t.Dict[DIContext, t.List[DIContext]]:
+        """
+        Technical detail of gathering the registered contexts each registered context
+        depends on.
+        """
+        # the import is postponed, as components depend on the container
+        from .component import get_constructor_dependencies
+
+        graph = {}
+        for context, resolution in self._constructor_registry.items():
+            dependencies = graph[context] = []
+            for dependency in get_constructor_dependencies(resolution.constructor):
+                if not dependency.is_determined():
+                    continue
+                dependency.validate()
+                if dependency in self._constructor_registry:
+                    dependencies.append(dependency)
+                    continue
+                candidates = self._get_candidates(dependency.interface, dependency.qualifier)
+                if not candidates:
+                    raise DIErrors.DEFINITION_NOT_FOUND.with_params(
+                        context=dependency, dependant=context
+                    )
+                if len(candidates) > 1:
+                    raise DIErrors.AMBIGUOUS_INTERFACE.with_params(
+                        context=dependency, candidates=candidates, dependant=context
+                    )
+                dependencies.append(candidates[0])
+        return graph
+
+    @staticmethod
+    def _sort_topologically(
+        graph: t.Dict[DIContext, t.List[DIContext]],
+    ) -> t.List[t.List[DIContext]]:
+        """
+        Technical detail of ordering contexts by their dependencies. Returns levels of
+        contexts: each one depends only on the contexts of the preceding levels.
+        """
+        depths: t.Dict[DIContext, int] = {}
+        path: t.List[DIContext] = []
+
+        def visit(context: DIContext) -> int:
+            if context in depths:
+                return depths[context]
+            if context in path:
+                cycle = path[path.index(context) :] + [context]
+                raise DIErrors.CIRCULAR_DEPENDENCY.with_params(cycle=cycle)
+            path.append(context)
+            depth = max((visit(dependency) + 1 for dependency in graph[context]), default=0)
+            path.pop()
+            depths[context] = depth
+            return depth
+
+        for context in graph:
+            visit(context)
+        levels: t.Dict[int, t.List[DIContext]] = {}
+        for context, depth in depths.items():
+            levels.setdefault(depth, []).append(context)
+        return [levels[depth] for depth in sorted(levels)]
 
     # Implementation of the scopes
 
@@ -222,18 +575,130 @@ class Container:
     def singleton_scope(
         self, constructor: Constructor, kwargs: Kwargs, context: DIContext
     ) -> t.Any:
-        """First injection makes a new instance, later ones return the same instance."""
+        """
+        First injection makes a new instance, later ones return the same instance.
+
+        The constructor is called exactly once, even when the instance is requested by many
+        threads at the same time: the registry is checked without locking and only a miss
+        is double-checked under a lock of the constructor. The instance is published when it's
+        complete, i.e. with its DI context already set.
+        """
+        try:
+            return self._singleton_registry[constructor]
+        except KeyError:
+            pass
+        with self._get_singleton_lock(constructor):
+            try:
+                return self._singleton_registry[constructor]
+            except KeyError:
+                instance = constructor(**kwargs)
+                set_di_context(instance, self, context)
+                self._singleton_registry[constructor] = instance
+                # the lock won't be needed anymore: later requests don't miss the registry
+                self._singleton_locks.pop(constructor, None)
+                return instance
+
+    def _get_singleton_lock(self, constructor: Constructor) -> threading.RLock:
+        """
+        Technical detail of getting the lock guarding construction of the singleton.
+        NB: it is reentrant, but a dependency cycle between singletons being constructed
+        in different threads still deadlocks.
+        """
+        with self._singleton_locks_guard:
+            try:
+                return self._singleton_locks[constructor]
+            except KeyError:
+                lock = self._singleton_locks[constructor] = threading.RLock()
+                return lock
+
+    def thread_scope(
+        self, constructor: Constructor, kwargs: Kwargs, context: DIContext = None
+    ) -> t.Any:
+        """First injection in a thread makes a new instance, later ones return the same one."""
+        registry = getattr(self._thread_registry, "instances", None)
+        if registry is None:
+            registry = self._thread_registry.instances = {}
+        return self._get_scoped(registry, constructor, kwargs, context)
+
+    def request_scope(
+        self, constructor: Constructor, kwargs: Kwargs, context: DIContext = None
+    ) -> t.Any:
+        """
+        First injection within an opened request scope makes a new instance, later ones
+        return the same instance. The scope follows the execution context, so it works with
+        both threads and asyncio tasks.
+        """
+        registry = self._request_registry.get()
+        if registry is None:
+            raise DIErrors.SCOPE_NOT_OPENED.with_params(scope=Scopes.REQUEST, context=context)
+        return self._get_scoped(registry, constructor, kwargs, context)
+
+    def _get_scoped(
+        self, registry: dict, constructor: Constructor, kwargs: Kwargs, context: DIContext
+    ) -> t.Any:
+        """Technical detail of getting an instance from the registry of a scope."""
         try:
-            instance = self._singleton_registry[constructor]
+            return registry[constructor]
         except KeyError:
-            instance = self._singleton_registry[constructor] = constructor(**kwargs)
+            instance = constructor(**kwargs)
             set_di_context(instance, self, context)
-        return instance
+            registry[constructor] = instance
+            return instance
+
+    @contextmanager
+    def scope_context(self, scope_type: "Scopes") -> t.Iterator[None]:
+        """
+        A context manager opening a new scope of given type: THREAD or REQUEST. Instances
+        created within the scope are disposed on its exit, i.e. their `close` method is called
+        (if any) in the reverse order of their creation.
+
+        >>> with container.scope_context(Scopes.REQUEST):
+        ...     interactor(request)
+        """
+        registry = {}
+        if scope_type is Scopes.REQUEST:
+            token = self._request_registry.set(registry)
+            try:
+                yield
+            finally:
+                self._request_registry.reset(token)
+                _dispose(registry)
+        elif scope_type is Scopes.THREAD:
+            previous = getattr(self._thread_registry, "instances", None)
+            self._thread_registry.instances = registry
+            try:
+                yield
+            finally:
+                self._thread_registry.instances = previous
+                _dispose(registry)
+        else:
+            raise DIErrors.SCOPE_NOT_CONTEXTUAL.with_params(scope=scope_type)
+
+
+def _dispose(registry: dict) -> None:
+    """
+    Technical detail of closing all the instances of a scope in the reverse order of their
+    creation. All of them are closed, even if some raise.
+    """
+    error = None
+    for instance in reversed(list(registry.values())):
+        close = getattr(instance, "close", None)
+        if not callable(close):
+            continue
+        try:
+            close()
+        except Exception as e:
+            error = error or e
+    registry.clear()
+    if error is not None:
+        raise error
 
 
 class Scopes(Enum):
     INSTANCE: "Scopes" = partial(Container.instance_scope)
     SINGLETON: "Scopes" = partial(Container.singleton_scope)
+    THREAD: "Scopes" = partial(Container.thread_scope)
+    REQUEST: "Scopes" = partial(Container.request_scope)
 
     def __call__(
         self,
@@ -1,7 +1,11 @@
 import inspect
 import typing as t
 
-from functools import wraps
+from functools import (
+    partial,
+    wraps,
+)
+from weakref import WeakKeyDictionary
 
 from .component import (
     Injectable,
@@ -11,13 +15,20 @@ from .container import (
     Constructor,
     Container,
     DIContext,
+    Resolver,
     Scopes,
     get_di_container,
     set_di_context,
     set_scope_type,
 )
-from .descriptors import Inject
-from .errors import DIErrors
+from .descriptors import (
+    Inject,
+    LazyProxy,
+)
+from .errors import (
+    ConfigError,
+    DIErrors,
+)
 
 
 def scope(scope_type: Scopes) -> t.Callable[[Constructor], Constructor]:
@@ -35,21 +46,67 @@ def scope(scope_type: Scopes) -> t.Callable[[Constructor], Constructor]:
     return decorator
 
 
+class _Binding:
+    """
+    Technical detail of the `inject` decorator: resolvers of the function's dependencies,
+    compiled for a single container. It's valid until the next registration in the container.
+    Singleton dependencies are resolved only once.
+    """
+
+    __slots__ = ("version", "resolvers")
+
+    def __init__(
+        self, container: Container, contexts: t.Dict[str, DIContext], lazy: t.Set[str]
+    ):
+        self.version = container._version
+        self.resolvers: t.Dict[str, Resolver] = {}
+        for name, context in contexts.items():
+            resolver = self._bind(container, name, context)
+            self.resolvers[name] = partial(LazyProxy, resolver) if name in lazy else resolver
+
+    def _bind(self, container: Container, name: str, context: DIContext) -> Resolver:
+        try:
+            context.validate()
+            resolver = container._get_resolver(context)
+        except ConfigError:
+            # the error is raised when (and only if) the dependency is needed
+            return partial(context.get, container)
+        if not container._is_singleton(resolver):
+            return resolver
+
+        def resolve_once():
+            value = resolver()
+            self.resolvers[name] = lambda: value
+            return value
+
+        return resolve_once
+
+
 def inject(f: Injectable) -> Injectable:
     """
     A decorator for injecting dependencies into functions. It looks for DI container
     either on the function itself or on its first argument (`self` when `f` is a method).
+
+    Resolvers of the dependencies are compiled once per container (and recompiled after
+    a new registration), so a call pays only for constructing non-singleton dependencies.
+    Arguments marked with `Inject(lazy=True)` get a `LazyProxy`, so their dependencies are
+    constructed only when used.
     """
     signature = inspect.signature(f)
     dependency_declarations: t.Dict[str, DIContext] = {}
+    lazy_dependencies: t.Set[str] = set()
 
     for name, param in signature.parameters.items():
         default = param.default
         if isinstance(default, Inject):
             dependency_declarations[name] = default.context
+            if default.lazy:
+                lazy_dependencies.add(name)
             if param.annotation is not param.empty:
                 object.__setattr__(default.context, "interface", param.annotation)
 
+    bindings: "WeakKeyDictionary[Container, _Binding]" = WeakKeyDictionary()
+
     @wraps(f)
     def wrapper(*args, **kwargs):
         # look for the DI container either on the function itself
@@ -62,13 +119,21 @@ def inject(f: Injectable) -> Injectable:
                 module=f.__module__, function=f.__qualname__
             )
 
-        # provide arguments that haven't been supplied by the call's kwargs
-        for name_, dependency_declaration in dependency_declarations.items():
-            if name_ not in kwargs:
-                kwargs[name_] = dependency_declaration.get(container)
+        binding = bindings.get(container)
+        if binding is None or binding.version != container._version:
+            binding = bindings[container] = _Binding(
+                container, dependency_declarations, lazy_dependencies
+            )
 
-        # finally, the call with all the injected arguments
-        return f(*args, **kwargs)
+        # provide arguments that haven't been supplied by the call's kwargs
+        resolvers = binding.resolvers
+        if kwargs:
+            injected = {
+                name_: resolver() for name_, resolver in resolvers.items() if name_ not in kwargs
+            }
+            # finally, the call with all the injected arguments
+            return f(*args, **injected, **kwargs)
+        return f(*args, **{name_: resolver() for name_, resolver in resolvers.items()})
 
     set_dependencies_contexts(
         wrapper, attribute_contexts=dependency_declarations, method_contexts={}
@@ -5,9 +5,12 @@ from dataclasses import (
     dataclass,
     field,
 )
+from functools import partial
 
 from .container import (
+    Container,
     DIContext,
+    Resolver,
     get_di_container,
 )
 from .errors import (
@@ -16,6 +19,73 @@ from .errors import (
 )
 
 
+_CACHE_REF = "__di_cache__"
+
+
+class LazyProxy:
+    """
+    A proxy of a dependency that is resolved on the first access to any of its attributes.
+    Then, the proxy delegates all the attribute access (and calls, item access, iteration, truth,
+    equality and `isinstance` checks) to the resolved dependency.
+    """
+
+    __slots__ = ("_lazy_resolver", "_lazy_target")
+
+    def __init__(self, resolver: Resolver):
+        object.__setattr__(self, "_lazy_resolver", resolver)
+
+    def _get_lazy_target(self) -> t.Any:
+        try:
+            return object.__getattribute__(self, "_lazy_target")
+        except AttributeError:
+            target = object.__getattribute__(self, "_lazy_resolver")()
+            object.__setattr__(self, "_lazy_target", target)
+            return target
+
+    @property  # type: ignore
+    def __class__(self) -> t.Type:
+        return type(self._get_lazy_target())
+
+    def __getattr__(self, name: str) -> t.Any:
+        if name in LazyProxy.__slots__:
+            raise AttributeError(name)
+        return getattr(self._get_lazy_target(), name)
+
+    def __setattr__(self, name: str, value: t.Any) -> None:
+        setattr(self._get_lazy_target(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self._get_lazy_target(), name)
+
+    def __call__(self, *args, **kwargs) -> t.Any:
+        return self._get_lazy_target()(*args, **kwargs)
+
+    def __getitem__(self, key: t.Any) -> t.Any:
+        return self._get_lazy_target()[key]
+
+    def __iter__(self) -> t.Iterator:
+        return iter(self._get_lazy_target())
+
+    def __len__(self) -> int:
+        return len(self._get_lazy_target())
+
+    def __bool__(self) -> bool:
+        return bool(self._get_lazy_target())
+
+    def __eq__(self, other: t.Any) -> bool:
+        return self._get_lazy_target() == other
+
+    def __hash__(self) -> int:
+        return hash(self._get_lazy_target())
+
+    def __repr__(self) -> str:
+        try:
+            target = object.__getattribute__(self, "_lazy_target")
+        except AttributeError:
+            return f"<LazyProxy of {object.__getattribute__(self, '_lazy_resolver')!r}>"
+        return f"<LazyProxy of {target!r}>"
+
+
 @dataclass(frozen=True)
 class Inject:
     """
@@ -24,6 +94,17 @@ class Inject:
         * a default value of a function argument
     that should be used to mark a place for injecting dependencies as an attribute or an argument
     of a function.
+
+    With `cache=True`, the descriptor memoizes the resolved dependency on the instance, so
+    repeated reads don't resolve it again. The memoized value is valid until the instance gets
+    another container or a new constructor is registered in the container. NB: for an
+    INSTANCE-scoped dependency it means that the instance gets the same dependency every time.
+    THREAD- and REQUEST-scoped dependencies are never memoized, as they live only as long
+    as their scope.
+
+    With `lazy=True`, a `LazyProxy` is injected instead of the dependency, so the dependency
+    is resolved (and constructed) on the first access to any of its attributes. NB: errors of
+    the resolution are postponed until then too.
     """
 
     context: DIContext = field(init=False)
@@ -34,6 +115,8 @@ class Inject:
 
     label: str = None
     annotation: t.Type = None
+    cache: bool = False
+    lazy: bool = False
 
     def __post_init__(
         self,
@@ -65,6 +148,42 @@ class Inject:
             raise DIErrors.NO_CONTAINER_PROVIDED.with_params(
                 class_name=instance.__class__.__qualname__, attribute=self.label
             )
+        if self.cache:
+            try:
+                cached = instance.__dict__[_CACHE_REF][self.label]
+            except (AttributeError, KeyError):
+                pass
+            else:
+                if cached[0] is container and cached[1] == container._version:
+                    return cached[2]
+        if self.lazy:
+            value = LazyProxy(partial(self._resolve, instance, container))
+        else:
+            value = self._resolve(instance, container)
+        if self.cache and self._is_memoizable(instance, container):
+            try:
+                cache = instance.__dict__.setdefault(_CACHE_REF, {})
+            except AttributeError:
+                # an instance without `__dict__` can't memoize anything
+                return value
+            cache[self.label] = (container, container._version, value)
+        return value
+
+    def _is_memoizable(self, instance: t.Any, container: Container) -> bool:
+        """
+        Technical detail of checking whether the dependency may be memoized on the instance:
+        THREAD- or REQUEST-scoped ones can't, as they mustn't outlive their scope.
+        """
+        context = self.context.determine(instance)
+        try:
+            context.validate()
+            return not container._is_contextual(context)
+        except ConfigError:
+            # i.e. a lazy dependency that can't be resolved isn't memoized either
+            return False
+
+    def _resolve(self, instance: t.Any, container: Container) -> t.Any:
+        """Technical detail of resolving the dependency for the instance."""
         context = self.context.determine(instance)
         try:
             return context.get(container=container)
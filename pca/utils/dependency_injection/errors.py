@@ -17,6 +17,12 @@ class DIErrors(ErrorCatalog):
             "or the interface."
         )
     )
+    AMBIGUOUS_INTERFACE = ConfigError(
+        hint=(
+            "The interface hasn't been registered and there are many registrations of its "
+            "subclasses. Register the interface explicitly or request one of the subclasses."
+        )
+    )
     NO_IDENTIFIER_SPECIFIED = ConfigError(hint="Missing both name and interface for Inject.")
     CONTRADICTORY_QUALIFIER_DEFINED = ConfigError(
         hint=(
@@ -32,3 +38,18 @@ class DIErrors(ErrorCatalog):
     NO_CONTAINER_PROVIDED = ConfigError(
         hint="DI resolving found no instance of the DI `Container` to work with."
     )
+    SCOPE_NOT_OPENED = ConfigError(
+        hint=(
+            "A dependency of a contextual scope was requested outside of the scope. Open it "
+            "with `Container.scope_context`."
+        )
+    )
+    SCOPE_NOT_CONTEXTUAL = ConfigError(
+        hint="Only THREAD and REQUEST scopes can be opened with `Container.scope_context`."
+    )
+    CIRCULAR_DEPENDENCY = ConfigError(
+        hint="Registered dependencies form a cycle, so they can't be constructed in order."
+    )
+    CONTAINER_FROZEN = ConfigError(
+        hint="The container has been frozen, so no more registrations are allowed."
+    )
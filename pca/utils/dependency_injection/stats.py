@@ -0,0 +1,68 @@
+import threading
+import typing as t
+
+from collections import (
+    Counter,
+    defaultdict,
+)
+
+
+class ResolutionStats:
+    """
+    Collects statistics of resolving dependencies by a `Container`:
+
+    * `compilations` - the number of compiled resolution plans
+    * `resolutions` - the number of resolutions per DI context
+    * `cache_hits` - the number of resolutions per DI context that returned an instance
+      already existing in its scope (SINGLETON, THREAD or REQUEST) instead of constructing one
+    * `constructions` & `construction_time` - the number of constructions and total seconds
+      they took, per (constructor, scope) pair. NB: construction time is inclusive, i.e. it
+      covers constructing all the dependencies resolved by the constructor itself
+
+    Enable it with `Container.enable_stats`. A disabled container compiles plain resolvers,
+    so it doesn't pay anything for the instrumentation.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.compilations = 0
+            self.resolutions: t.Counter[t.Any] = Counter()
+            self.cache_hits: t.Counter[t.Any] = Counter()
+            self.constructions: t.Counter[t.Tuple[t.Any, t.Any]] = Counter()
+            self.construction_time: t.Dict[t.Tuple[t.Any, t.Any], float] = defaultdict(float)
+
+    def record_compilation(self) -> None:
+        with self._lock:
+            self.compilations += 1
+
+    def record_resolution(
+        self, context: t.Any, constructor: t.Any, scope: t.Any, hit: bool, elapsed: float
+    ) -> None:
+        with self._lock:
+            self.resolutions[context] += 1
+            if hit:
+                self.cache_hits[context] += 1
+            else:
+                self.constructions[(constructor, scope)] += 1
+                self.construction_time[(constructor, scope)] += elapsed
+
+    def report(self) -> t.Dict[str, t.Any]:
+        """Returns a snapshot of the statistics as a dict of plain values."""
+        with self._lock:
+            return {
+                "compilations": self.compilations,
+                "resolutions": dict(self.resolutions),
+                "cache_hits": dict(self.cache_hits),
+                "constructions": {
+                    key: {
+                        "count": count,
+                        "total_time": self.construction_time[key],
+                        "mean_time": self.construction_time[key] / count,
+                    }
+                    for key, count in self.constructions.items()
+                },
+            }
@@ -1,5 +1,12 @@
+import abc
+import asyncio
 import platform
+import threading
+import time
 
+from concurrent.futures import ThreadPoolExecutor
+
+import mock
 import pytest
 
 from pca.exceptions import ConfigError
@@ -13,6 +20,7 @@ from pca.utils.dependency_injection import (
     create_component,
     get_di_context,
     get_scope_type,
+    inject,
     scope,
 )
 
@@ -22,6 +30,7 @@ from .components import (
     CustomColoredWheel,
     FrameInterface,
     GravelFrame,
+    GravelWheel,
     RoadFrame,
     RoadWheel,
     WheelInterface,
@@ -97,6 +106,27 @@ class TestContainer:
         }
 
 
+class TestResolutionPlans:
+    def test_resolver_cached(self, container):
+        container.register_by_interface(interface=WheelInterface, constructor=RoadWheel)
+        container.find_by_interface(WheelInterface)
+        resolver = container._resolvers[(WheelInterface, None)]
+        container.find_by_interface(WheelInterface)
+        assert container._resolvers[(WheelInterface, None)] is resolver
+        assert resolver().name == "Road wheel"
+
+    def test_resolver_invalidated(self, container):
+        container.register_by_name(name="frame", constructor=GravelFrame)
+        instance_1 = container.find_by_name("frame")
+        container.register_by_name(name="frame", constructor=RoadFrame, qualifier="road")
+        assert not container._resolvers
+        # re-registering a constructor with another scope changes the way it is resolved
+        container.register_by_name(name="gravel", constructor=GravelFrame, scope=Scopes.SINGLETON)
+        instance_2 = container.find_by_name("frame")
+        assert instance_2 is not instance_1
+        assert container.find_by_name("frame") is instance_2
+
+
 class TestScopes:
     def test_scope_class(self, container):
         assert repr(Scopes.INSTANCE) == f"<Scopes.{Scopes.INSTANCE.name}>"
@@ -119,6 +149,376 @@ class TestScopes:
         instance_2 = container.find_by_name("frame")
         assert instance_1 is instance_2
 
+    def test_singleton_scope_concurrent(self, container):
+        calls = []
+        barrier = threading.Barrier(8)
+
+        @scope(Scopes.SINGLETON)
+        class SlowFrame(FrameInterface):
+            def __init__(self):
+                calls.append(self)
+                time.sleep(0.01)
+
+        def find():
+            barrier.wait()
+            return container.find_by_name("frame")
+
+        container.register_by_name(name="frame", constructor=SlowFrame)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            instances = list(executor.map(lambda _: find(), range(8)))
+        assert len(calls) == 1
+        assert all(instance is calls[0] for instance in instances)
+        assert get_di_context(calls[0]) == DIContext(name="frame")
+        assert not container._singleton_locks
+
+
+class TestContextualScopes:
+    @pytest.fixture
+    def frame_class(self):
+        class Frame(FrameInterface):
+            closed = False
+
+            def close(self):
+                self.closed = True
+
+        return Frame
+
+    @pytest.fixture
+    def thread_container(self, container, frame_class):
+        container.register_by_name(name="frame", constructor=frame_class, scope=Scopes.THREAD)
+        return container
+
+    @pytest.fixture
+    def request_container(self, container, frame_class):
+        container.register_by_name(name="frame", constructor=frame_class, scope=Scopes.REQUEST)
+        return container
+
+    def test_thread_scope(self, thread_container):
+        instance = thread_container.find_by_name("frame")
+        assert thread_container.find_by_name("frame") is instance
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            other = executor.submit(thread_container.find_by_name, "frame").result()
+        assert other is not instance
+
+    def test_thread_scope_context(self, thread_container):
+        outer = thread_container.find_by_name("frame")
+        with thread_container.scope_context(Scopes.THREAD):
+            inner = thread_container.find_by_name("frame")
+            assert inner is not outer
+        assert inner.closed
+        assert not outer.closed
+        assert thread_container.find_by_name("frame") is outer
+
+    def test_request_scope(self, request_container):
+        with request_container.scope_context(Scopes.REQUEST):
+            instance_1 = request_container.find_by_name("frame")
+            assert request_container.find_by_name("frame") is instance_1
+        with request_container.scope_context(Scopes.REQUEST):
+            instance_2 = request_container.find_by_name("frame")
+        assert instance_2 is not instance_1
+        assert instance_1.closed and instance_2.closed
+
+    def test_request_scope_asyncio(self, request_container):
+        async def handle_request():
+            with request_container.scope_context(Scopes.REQUEST):
+                instance = request_container.find_by_name("frame")
+                await asyncio.sleep(0)
+                assert request_container.find_by_name("frame") is instance
+                return instance
+
+        async def handle_requests():
+            return await asyncio.gather(handle_request(), handle_request())
+
+        loop = asyncio.new_event_loop()
+        try:
+            instance_1, instance_2 = loop.run_until_complete(handle_requests())
+        finally:
+            loop.close()
+        assert instance_1 is not instance_2
+
+    def test_request_scope_not_opened(self, request_container):
+        with pytest.raises(ConfigError) as error_info:
+            request_container.find_by_name("frame")
+        assert error_info.value == DIErrors.SCOPE_NOT_OPENED
+
+    def test_dispose_order(self, container):
+        closed = []
+
+        class Wheel(WheelInterface):
+            def close(self):
+                closed.append(self)
+
+        class Frame(FrameInterface, Component):
+            wheel: WheelInterface = Inject(cache=True)
+
+            def __init__(self):
+                closed.append(None)
+
+            def close(self):
+                closed.append(self)
+
+        container.register_by_interface(WheelInterface, Wheel, scope=Scopes.REQUEST)
+        container.register_by_name(name="frame", constructor=Frame, scope=Scopes.REQUEST)
+        with container.scope_context(Scopes.REQUEST):
+            frame = container.find_by_name("frame")
+            wheel = frame.wheel
+        assert closed == [None, wheel, frame]
+
+    def test_not_contextual_scope(self, container):
+        with pytest.raises(ConfigError) as error_info:
+            with container.scope_context(Scopes.SINGLETON):
+                pass
+        assert error_info.value == DIErrors.SCOPE_NOT_CONTEXTUAL
+
+
+class TestWarmUp:
+    @pytest.fixture
+    def classes(self):
+        constructed = []
+
+        @scope(Scopes.SINGLETON)
+        class Wheel(WheelInterface):
+            def __init__(self):
+                constructed.append(self)
+
+        @scope(Scopes.SINGLETON)
+        class Frame(FrameInterface, Component):
+            wheel: WheelInterface = Inject()
+
+            def __init__(self):
+                constructed.append(self)
+
+        class Rider(Component):
+            @inject
+            def ride(self, frame: FrameInterface = Inject(), bell=Inject(get_qualifier=id)):
+                pass
+
+        return constructed, Wheel, Frame, Rider
+
+    @pytest.mark.parametrize("parallel", [False, True])
+    def test_warm_up(self, container, classes, parallel):
+        constructed, wheel_class, frame_class, rider_class = classes
+        container.register_by_name("rider", rider_class)
+        container.register_by_interface(FrameInterface, frame_class)
+        container.register_by_interface(WheelInterface, wheel_class)
+        container.warm_up(parallel=parallel)
+        assert [type(instance) for instance in constructed] == [wheel_class, frame_class]
+        assert container.find_by_interface(FrameInterface) is constructed[1]
+        # non-singletons are still constructed on demand
+        assert container.find_by_name("rider") is not container.find_by_name("rider")
+
+    def test_warm_up_with_stats(self, container, classes):
+        constructed, wheel_class, frame_class, rider_class = classes
+        container.register_by_interface(FrameInterface, frame_class)
+        container.register_by_interface(WheelInterface, wheel_class)
+        container.enable_stats()
+        container.warm_up()
+        assert [type(instance) for instance in constructed] == [wheel_class, frame_class]
+
+    def test_missing_definition(self, container, classes):
+        constructed, wheel_class, frame_class, rider_class = classes
+        container.register_by_name("rider", rider_class)
+        container.register_by_interface(FrameInterface, frame_class)
+        with pytest.raises(ConfigError) as error_info:
+            container.warm_up()
+        assert error_info.value == DIErrors.DEFINITION_NOT_FOUND
+        assert error_info.value.params == {
+            "context": DIContext(interface=WheelInterface),
+            "dependant": DIContext(interface=FrameInterface),
+        }
+        assert not constructed
+
+    def test_circular_dependency(self, container):
+        class Wheel(WheelInterface, Component):
+            frame: FrameInterface = Inject()
+
+        class Frame(FrameInterface, Component):
+            wheel: WheelInterface = Inject()
+
+        container.register_by_interface(FrameInterface, Frame)
+        container.register_by_interface(WheelInterface, Wheel)
+        with pytest.raises(ConfigError) as error_info:
+            container.warm_up()
+        assert error_info.value == DIErrors.CIRCULAR_DEPENDENCY
+        assert error_info.value.params["cycle"] == [
+            DIContext(interface=FrameInterface),
+            DIContext(interface=WheelInterface),
+            DIContext(interface=FrameInterface),
+        ]
+
+
+class TestInterfaceHierarchy:
+    class SuspensionInterface(FrameInterface):
+        pass
+
+    class Suspension(SuspensionInterface):
+        pass
+
+    def test_exact_match_first(self, container):
+        container.register_by_interface(self.SuspensionInterface, self.Suspension)
+        container.register_by_interface(FrameInterface, RoadFrame)
+        assert isinstance(container.find_by_interface(FrameInterface), RoadFrame)
+
+    def test_subclass_match(self, container):
+        container.register_by_interface(self.SuspensionInterface, self.Suspension)
+        container.register_by_interface(WheelInterface, RoadWheel, qualifier="road")
+        assert isinstance(container.find_by_interface(FrameInterface), self.Suspension)
+        assert container._candidates[(FrameInterface, None)] == [
+            DIContext(interface=self.SuspensionInterface)
+        ]
+        # the qualifier has to match as well
+        with pytest.raises(ConfigError) as error_info:
+            container.find_by_interface(WheelInterface)
+        assert error_info.value == DIErrors.DEFINITION_NOT_FOUND
+
+    def test_abc_match(self, container):
+        class Resizable(abc.ABC):
+            pass
+
+        Resizable.register(self.SuspensionInterface)
+        container.register_by_interface(self.SuspensionInterface, self.Suspension)
+        assert isinstance(container.find_by_interface(Resizable), self.Suspension)
+
+    def test_ambiguous(self, container):
+        container.register_by_interface(self.SuspensionInterface, self.Suspension)
+        container.register_by_interface(self.Suspension, self.Suspension)
+        with pytest.raises(ConfigError) as error_info:
+            container.find_by_interface(FrameInterface)
+        assert error_info.value == DIErrors.AMBIGUOUS_INTERFACE
+        assert error_info.value.params["candidates"] == [
+            DIContext(interface=self.SuspensionInterface),
+            DIContext(interface=self.Suspension),
+        ]
+
+    def test_invalidated_by_registration(self, container):
+        container.register_by_interface(self.SuspensionInterface, self.Suspension)
+        container.find_by_interface(FrameInterface)
+        container.register_by_interface(FrameInterface, RoadFrame)
+        assert not container._candidates
+        assert isinstance(container.find_by_interface(FrameInterface), RoadFrame)
+
+
+class TestFreeze:
+    class SuspensionInterface(FrameInterface):
+        pass
+
+    class Suspension(SuspensionInterface, Component):
+        wheel: WheelInterface = Inject()
+
+    @pytest.fixture
+    def container(self, container):
+        container.register_by_interface(self.SuspensionInterface, self.Suspension)
+        container.register_by_interface(WheelInterface, RoadWheel)
+        container.register_by_interface(WheelInterface, GravelWheel, qualifier="gravel")
+        return container
+
+    def test_registration_locked(self, container):
+        container.freeze()
+        assert container.is_frozen
+        with pytest.raises(ConfigError) as error_info:
+            container.register_by_name("frame", RoadFrame)
+        assert error_info.value == DIErrors.CONTAINER_FROZEN
+
+    def test_lookup_table(self, container):
+        timings = container.freeze()
+        assert set(timings) == {
+            DIContext(interface=self.SuspensionInterface),
+            DIContext(interface=FrameInterface),
+            DIContext(interface=WheelInterface),
+            DIContext(interface=WheelInterface, qualifier="gravel"),
+        }
+        suspension = container.find_by_interface(self.SuspensionInterface)
+        assert suspension.wheel.name == "Road wheel"
+        assert isinstance(container.find_by_interface(FrameInterface), self.Suspension)
+        assert isinstance(DIContext(interface=FrameInterface).get(container), self.Suspension)
+
+    def test_ambiguous_base_interface(self, container):
+        class AnotherSuspensionInterface(FrameInterface):
+            pass
+
+        container.register_by_interface(AnotherSuspensionInterface, RoadFrame)
+        container.freeze()
+        with pytest.raises(ConfigError) as error_info:
+            container.find_by_interface(FrameInterface)
+        assert error_info.value == DIErrors.AMBIGUOUS_INTERFACE
+
+    def test_invalid_context(self, container):
+        container.freeze()
+        with pytest.raises(ConfigError) as error_info:
+            DIContext(name="wheel", interface=WheelInterface).get(container)
+        assert error_info.value == DIErrors.AMBIGUOUS_DEFINITION
+
+    def test_measure(self, container):
+        constructor = mock.Mock()
+        container.register_by_name("frame", constructor, scope=Scopes.REQUEST)
+        timings = container.freeze(measure=True)
+        assert all(timing >= 0 for timing in timings.values())
+        constructor.assert_not_called()
+
+    def test_constructor_key_error(self, container):
+        constructor = mock.Mock(side_effect=KeyError("foo"))
+        container.register_by_name("frame", constructor, scope=Scopes.INSTANCE)
+        container.freeze()
+        with pytest.raises(KeyError):
+            DIContext(name="frame").get(container)
+        constructor.assert_called_once_with()
+
+
+class TestStats:
+    @pytest.fixture
+    def frame_class(self):
+        @scope(Scopes.SINGLETON)
+        class Frame(FrameInterface):
+            pass
+
+        return Frame
+
+    @pytest.fixture
+    def container(self, container, frame_class):
+        container.register_by_interface(FrameInterface, frame_class)
+        container.register_by_interface(WheelInterface, RoadWheel, scope=Scopes.INSTANCE)
+        return container
+
+    def test_disabled(self, container):
+        assert container.stats is None
+        container.find_by_interface(FrameInterface)
+        resolver = container._resolvers[(FrameInterface, None)]
+        assert resolver.func is Scopes.SINGLETON.value.func
+
+    def test_report(self, container, frame_class):
+        stats = container.enable_stats()
+        assert container.enable_stats() is stats
+        for _ in range(3):
+            container.find_by_interface(FrameInterface)
+            container.find_by_interface(WheelInterface)
+        report = stats.report()
+        assert report["compilations"] == 2
+        frame_context = DIContext(interface=FrameInterface)
+        wheel_context = DIContext(interface=WheelInterface)
+        assert report["resolutions"] == {frame_context: 3, wheel_context: 3}
+        assert report["cache_hits"] == {frame_context: 2}
+        assert report["constructions"].keys() == {
+            (frame_class, Scopes.SINGLETON),
+            (RoadWheel, Scopes.INSTANCE),
+        }
+        wheel_constructions = report["constructions"][(RoadWheel, Scopes.INSTANCE)]
+        assert wheel_constructions["count"] == 3
+        assert wheel_constructions["total_time"] >= wheel_constructions["mean_time"] >= 0
+
+    def test_disable(self, container):
+        stats = container.enable_stats()
+        container.find_by_interface(FrameInterface)
+        container.disable_stats()
+        container.find_by_interface(FrameInterface)
+        assert container.stats is None
+        assert stats.report()["resolutions"] == {DIContext(interface=FrameInterface): 1}
+
+    def test_frozen(self, container):
+        container.freeze()
+        stats = container.enable_stats()
+        DIContext(interface=WheelInterface).get(container)
+        assert stats.report()["resolutions"] == {DIContext(interface=WheelInterface): 1}
+
 
 class TestContext:
     @pytest.fixture
@@ -9,6 +9,7 @@ from pca.utils.dependency_injection import (
     DIContext,
     DIErrors,
     Inject,
+    Scopes,
     container_supplier,
     create_component,
     inject,
@@ -108,3 +109,58 @@ class TestInjectDecorator:
 
         mock_dependency.assert_called_once_with(foo="bar")
         assert result == 42
+
+    def test_singleton_resolved_once(self, container, context):
+        constructor = mock.Mock()
+        container.register_by_name("dependency", constructor, scope=Scopes.SINGLETON)
+
+        @container_supplier
+        @inject
+        def f(dependency=Inject(name="dependency")):
+            return dependency
+
+        f_closure = f(container, context)
+        assert f_closure() is f_closure() is constructor.return_value
+        constructor.assert_called_once_with()
+
+    def test_singleton_resolved_once_with_stats(self, container, context):
+        constructor = mock.Mock()
+        container.register_by_name("dependency", constructor, scope=Scopes.SINGLETON)
+        stats = container.enable_stats()
+
+        @container_supplier
+        @inject
+        def f(dependency=Inject(name="dependency")):
+            return dependency
+
+        f_closure = f(container, context)
+        assert f_closure() is f_closure() is constructor.return_value
+        assert stats.report()["resolutions"] == {DIContext(name="dependency"): 1}
+
+    def test_rebinding_after_registration(self, container, context):
+        @container_supplier
+        @inject
+        def f(dependency=Inject(name="dependency")):
+            return dependency.name
+
+        f_closure = f(container, context)
+        with pytest.raises(ConfigError) as error_info:
+            f_closure()
+        assert error_info.value == DIErrors.DEFINITION_NOT_FOUND
+        container.register_by_name("dependency", GravelWheel)
+        assert f_closure() == "Gravel wheel"
+
+    def test_lazy(self, container, context):
+        constructor = mock.Mock()
+        container.register_by_name("dependency", constructor)
+
+        @container_supplier
+        @inject
+        def f(use: bool, dependency=Inject(name="dependency", lazy=True)):
+            return dependency.name if use else None
+
+        f_closure = f(container, context)
+        assert f_closure(use=False) is None
+        constructor.assert_not_called()
+        assert f_closure(use=True) is constructor.return_value.name
+        constructor.assert_called_once_with()
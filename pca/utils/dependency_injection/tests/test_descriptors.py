@@ -5,10 +5,14 @@ import pytest
 from pca.exceptions import ConfigError
 from pca.utils.dependency_injection import (
     Component,
+    Container,
     DIErrors,
     Inject,
+    LazyProxy,
+    Scopes,
     create_component,
     get_attribute_dependencies,
+    set_di_context,
 )
 
 from .components import (
@@ -92,3 +96,129 @@ class TestInjectDescriptor:
         # instance is an non-DI-aware object
         instance = object()
         assert get_attribute_dependencies(instance) == {}
+
+
+class TestInjectCache:
+    @pytest.fixture
+    def bike_class(self):
+        class Bike(Component):
+            wheel: WheelInterface = Inject(cache=True)
+            frame: FrameInterface = Inject()
+
+        return Bike
+
+    @pytest.fixture
+    def instance(self, container, bike_class):
+        class Frame(FrameInterface):
+            pass
+
+        container.register_by_interface(FrameInterface, Frame)
+        container.register_by_interface(WheelInterface, RoadWheel)
+        return create_component(bike_class, container)
+
+    def test_memoized(self, instance):
+        wheel, frame = instance.wheel, instance.frame
+        assert instance.wheel is wheel
+        # not cached: a new instance at each access of an INSTANCE-scoped dependency
+        assert instance.frame is not frame
+
+    def test_invalidated_by_registration(self, container, instance):
+        wheel = instance.wheel
+        container.register_by_name("wheels", GravelWheel)
+        assert instance.wheel is not wheel
+        assert instance.wheel is instance.wheel
+
+    @pytest.mark.parametrize("scope", [Scopes.REQUEST, Scopes.THREAD])
+    def test_contextual_scope_not_memoized(self, scope, bike_class):
+        class Wheel(WheelInterface):
+            closed = False
+
+            def close(self):
+                self.closed = True
+
+        container = Container()
+        container.register_by_interface(WheelInterface, Wheel, scope=scope)
+        instance = create_component(bike_class, container)
+        with container.scope_context(scope):
+            wheel = instance.wheel
+            assert instance.wheel is wheel
+        assert wheel.closed
+        with container.scope_context(scope):
+            assert instance.wheel is not wheel
+            assert not instance.wheel.closed
+
+    def test_invalidated_by_container(self, container, instance):
+        wheel = instance.wheel
+        other_container = Container(default_scope=Scopes.INSTANCE)
+        other_container.register_by_interface(WheelInterface, GravelWheel)
+        set_di_context(instance, other_container, None)
+        assert instance.wheel is not wheel
+        assert instance.wheel.name == "Gravel wheel"
+
+
+class TestLazyInject:
+    @pytest.fixture
+    def constructed(self):
+        return []
+
+    @pytest.fixture
+    def instance(self, container, constructed):
+        class Wheel(WheelInterface):
+            name = "Lazy wheel"
+            spokes = [1, 2, 3]
+
+            def __init__(self):
+                constructed.append(self)
+
+            def __call__(self, value):
+                return value * 2
+
+        class Bike(Component):
+            wheel: WheelInterface = Inject(lazy=True)
+
+        container.register_by_interface(WheelInterface, Wheel)
+        return create_component(Bike, container)
+
+    def test_lazy_resolution(self, instance, constructed):
+        wheel = instance.wheel
+        assert isinstance(wheel, LazyProxy)
+        assert repr(wheel).startswith("<LazyProxy of functools.partial")
+        assert not constructed
+        assert wheel.name == "Lazy wheel"
+        assert constructed == [object.__getattribute__(wheel, "_lazy_target")]
+        assert wheel.name == "Lazy wheel"
+        assert len(constructed) == 1
+
+    def test_delegation(self, instance, constructed):
+        wheel = instance.wheel
+        assert isinstance(wheel, WheelInterface)
+        assert wheel(21) == 42
+        assert list(wheel.spokes) == [1, 2, 3]
+        wheel.name = "Renamed wheel"
+        assert constructed[0].name == "Renamed wheel"
+
+    def test_truth_and_equality(self, container):
+        class Frame:
+            pass
+
+        frame = Frame()
+
+        class Bike(Component):
+            frame: FrameInterface = Inject(lazy=True)
+
+        container.register_by_interface(FrameInterface, lambda: frame)
+        instance = create_component(Bike, container)
+        assert instance.frame
+        assert instance.frame == frame
+        assert hash(instance.frame) == hash(frame)
+        assert instance.frame in {frame}
+
+    def test_lazy_errors(self, container):
+        class Bike(Component):
+            frame: FrameInterface = Inject(lazy=True)
+
+        instance = create_component(Bike, container)
+        frame = instance.frame
+        with pytest.raises(ConfigError) as error_info:
+            frame.name
+        assert error_info.value == DIErrors.DEFINITION_NOT_FOUND
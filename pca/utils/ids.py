@@ -0,0 +1,199 @@
+"""
+Generators of unique ids, safe to be used by many threads and many processes at once.
+Each of them is a callable with no arguments, so it can serve both as a `generator` of
+an `AutoId` and as an `id_generator` of a DAO.
+"""
+import os
+import threading
+import time
+import typing as t
+import uuid
+
+
+_CROCKFORD_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class BlockSequence:
+    """
+    A sequence of integers shared by many processes via a counter in a SQLite database file.
+    Each process reserves a block of `block_size` consecutive ids with a single transaction
+    and hands them out from memory, so the database is hit once per block.
+
+    Ids are unique across the processes, but increasing only within a process: an id
+    generated later by another process may be lower. Unused ids of a block are lost when
+    the process ends.
+
+    NB: the file has to be accessible to all the processes, i.e. on a local filesystem.
+    """
+
+    def __init__(self, path: str, name: str = "default", block_size: int = 1000, start: int = 1):
+        assert block_size > 0
+        self._path = path
+        self._name = name
+        self._block_size = block_size
+        self._start = start
+        self._lock = threading.Lock()
+        self._pid: t.Optional[int] = None
+        self._next = self._end = 0
+
+    def __call__(self) -> int:
+        with self._lock:
+            pid = os.getpid()
+            # a forked process can't use the block of its parent
+            if self._next >= self._end or self._pid != pid:
+                self._next, self._end = self._reserve()
+                self._pid = pid
+            id_ = self._next
+            self._next += 1
+            return id_
+
+    def _reserve(self) -> t.Tuple[int, int]:
+        """Technical detail of reserving the next block of the sequence."""
+        # sqlite3 is optional (i.e. Python may be built without it), so it's needed only here
+        import sqlite3
+
+        connection = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+        try:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sequences "
+                "(name TEXT PRIMARY KEY, next_value INTEGER NOT NULL)"
+            )
+            # takes the write lock at once, so concurrent reservations are serialized
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT next_value FROM sequences WHERE name = ?", (self._name,)
+                ).fetchone()
+                start = row[0] if row else self._start
+                end = start + self._block_size
+                connection.execute(
+                    "INSERT OR REPLACE INTO sequences (name, next_value) VALUES (?, ?)",
+                    (self._name, end),
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        finally:
+            connection.close()
+        return start, end
+
+
+class Snowflake:
+    """
+    Generator of 64-bit integer ids made of a timestamp in milliseconds since the `epoch`
+    (41 bits, enough for ~69 years), an id of the worker (10 bits) and a sequence number
+    within the millisecond (12 bits). Ids of a worker are strictly increasing and ids of all
+    the workers are roughly ordered by time.
+
+    Each of the concurrently working processes has to be given its own `worker_id`.
+    Up to 4096 ids per millisecond are generated; above that, or when the clock moves
+    backwards, ids are generated in advance of the clock rather than waiting for it.
+    """
+
+    WORKER_BITS: t.ClassVar[int] = 10
+    SEQUENCE_BITS: t.ClassVar[int] = 12
+    DEFAULT_EPOCH: t.ClassVar[int] = 1577836800000
+    """2020-01-01T00:00:00Z in milliseconds."""
+
+    def __init__(self, worker_id: int, epoch: int = DEFAULT_EPOCH):
+        assert 0 <= worker_id < 1 << self.WORKER_BITS, f"Invalid worker id: {worker_id}"
+        self._worker = worker_id << self.SEQUENCE_BITS
+        self._epoch = epoch
+        self._lock = threading.Lock()
+        self._last = -1
+        self._sequence = 0
+
+    def __call__(self) -> int:
+        with self._lock:
+            now = _now_ms() - self._epoch
+            if now > self._last:
+                self._last = now
+                self._sequence = 0
+            else:
+                self._sequence = (self._sequence + 1) & ((1 << self.SEQUENCE_BITS) - 1)
+                if not self._sequence:
+                    # the sequence is exhausted: borrowing the next millisecond
+                    self._last += 1
+            return (
+                (self._last << (self.WORKER_BITS + self.SEQUENCE_BITS))
+                | self._worker
+                | self._sequence
+            )
+
+
+class _MonotonicRandom:
+    """
+    Technical detail of generating pairs of a timestamp in milliseconds and random bits,
+    which are increasing within a process: within the same millisecond, the random part
+    of the previous pair is incremented.
+    """
+
+    def __init__(self, bits: int):
+        self._bits = bits
+        self._lock = threading.Lock()
+        self._pid: t.Optional[int] = None
+        self._last = -1
+        self._random = 0
+
+    def _draw(self) -> int:
+        # leaving a margin for the increments within a millisecond
+        return int.from_bytes(os.urandom((self._bits + 7) // 8), "big") >> (
+            (self._bits + 7) // 8 * 8 - self._bits + 1
+        )
+
+    def __call__(self) -> t.Tuple[int, int]:
+        with self._lock:
+            now = _now_ms()
+            pid = os.getpid()
+            if now > self._last or self._pid != pid:
+                # a forked process draws its own random bits, not to repeat its parent
+                self._last = max(now, self._last)
+                self._random = self._draw()
+                self._pid = pid
+            else:
+                self._random += 1
+                if self._random >> self._bits:
+                    self._last += 1
+                    self._random = self._draw()
+            return self._last, self._random
+
+
+_ulid_source = _MonotonicRandom(80)
+_uuid7_source = _MonotonicRandom(74)
+
+
+def ulid() -> str:
+    """
+    Generates a ULID: a 26-character, lexicographically sortable identifier made of
+    a timestamp in milliseconds (48 bits) and random bits (80 bits), encoded with
+    the Crockford's base32. ULIDs generated by a process are strictly increasing.
+    """
+    timestamp, random_bits = _ulid_source()
+    value = (timestamp << 80) | random_bits
+    chars = []
+    for _ in range(26):
+        chars.append(_CROCKFORD_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generates a UUID version 7: a timestamp in milliseconds (48 bits) followed by random
+    bits (74 bits), so UUIDs are ordered by the time of their generation, which keeps
+    database indexes compact. UUIDs generated by a process are strictly increasing.
+    """
+    timestamp, random_bits = _uuid7_source()
+    value = (
+        (timestamp << 80)
+        | (7 << 76)
+        | ((random_bits >> 62) << 64)
+        | (0b10 << 62)
+        | (random_bits & ((1 << 62) - 1))
+    )
+    return uuid.UUID(int=value)
@@ -0,0 +1,134 @@
+import multiprocessing
+import re
+import subprocess
+import sys
+import threading
+import uuid
+
+import mock
+import pytest
+
+from pca.utils.ids import (
+    BlockSequence,
+    Snowflake,
+    _MonotonicRandom,
+    ulid,
+    uuid7,
+)
+
+
+def _generate_block(path, queue):
+    generator = BlockSequence(path, block_size=10)
+    queue.put([generator() for _ in range(25)])
+
+
+class TestBlockSequence:
+    @pytest.fixture
+    def path(self, tmpdir):
+        return str(tmpdir.join("ids.sqlite"))
+
+    def test_sqlite3_optional(self):
+        # sqlite3 is needed only to reserve a block, not to import the ids (nor the domain)
+        code = "import sys; sys.modules['sqlite3'] = None; import pca.utils.ids, pca.domain"
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_blocks(self, path):
+        generator_1 = BlockSequence(path, block_size=3)
+        generator_2 = BlockSequence(path, block_size=3)
+        assert [generator_1() for _ in range(2)] == [1, 2]
+        assert [generator_2() for _ in range(4)] == [4, 5, 6, 7]
+        assert [generator_1() for _ in range(2)] == [3, 10]
+
+    def test_names(self, path):
+        bikes = BlockSequence(path, name="bikes", start=100)
+        rentals = BlockSequence(path, name="rentals")
+        assert (bikes(), rentals(), bikes()) == (100, 1, 101)
+
+    def test_reservations(self, path):
+        generator = BlockSequence(path, block_size=10)
+        with mock.patch.object(generator, "_reserve", wraps=generator._reserve) as reserve:
+            ids = [generator() for _ in range(25)]
+        assert ids == list(range(1, 26))
+        assert reserve.call_count == 3
+
+    def test_threads(self, path):
+        generator = BlockSequence(path, block_size=7)
+        ids = []
+        threads = [
+            threading.Thread(target=lambda: ids.extend(generator() for _ in range(100)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(ids) == list(range(1, 401))
+
+    def test_processes(self, path):
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        processes = [context.Process(target=_generate_block, args=(path, queue)) for _ in range(3)]
+        for process in processes:
+            process.start()
+        ids = [id_ for _ in processes for id_ in queue.get(timeout=30)]
+        for process in processes:
+            process.join()
+        assert len(set(ids)) == 75
+
+
+class TestSnowflake:
+    def test_layout(self):
+        generator = Snowflake(worker_id=5, epoch=0)
+        with mock.patch("pca.utils.ids._now_ms", return_value=1000):
+            ids = [generator() for _ in range(3)]
+        assert ids == [(1000 << 22) | (5 << 12) | sequence for sequence in range(3)]
+
+    def test_increasing(self):
+        generator = Snowflake(worker_id=1)
+        ids = [generator() for _ in range(10000)]
+        assert ids == sorted(set(ids))
+
+    def test_clock_moving_backwards(self):
+        generator = Snowflake(worker_id=1, epoch=0)
+        with mock.patch("pca.utils.ids._now_ms", side_effect=[1000, 999]):
+            first, second = generator(), generator()
+        assert second == first + 1
+
+    def test_sequence_overflow(self):
+        generator = Snowflake(worker_id=1, epoch=0)
+        with mock.patch("pca.utils.ids._now_ms", return_value=1000):
+            ids = [generator() for _ in range(4097)]
+        assert ids == sorted(set(ids))
+        assert ids[-1] >> 22 == 1001
+
+    def test_invalid_worker(self):
+        with pytest.raises(AssertionError):
+            Snowflake(worker_id=1024)
+
+
+class TestUlid:
+    def test_format(self):
+        assert re.fullmatch("[0-9A-HJKMNP-TV-Z]{26}", ulid())
+
+    def test_increasing(self):
+        with mock.patch("pca.utils.ids._now_ms", return_value=1000), mock.patch(
+            "pca.utils.ids._ulid_source", _MonotonicRandom(80)
+        ):
+            ids = [ulid() for _ in range(1000)]
+        assert ids == sorted(set(ids))
+        assert all(id_.startswith("00000000Z8") for id_ in ids)
+
+
+class TestUuid7:
+    def test_format(self):
+        value = uuid7()
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+    def test_increasing(self):
+        with mock.patch("pca.utils.ids._now_ms", return_value=1000), mock.patch(
+            "pca.utils.ids._uuid7_source", _MonotonicRandom(74)
+        ):
+            ids = [uuid7() for _ in range(1000)]
+        assert ids == sorted(set(ids))
+        assert all(id_.int >> 80 == 1000 for id_ in ids)